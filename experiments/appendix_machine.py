@@ -5,18 +5,15 @@ import matplotlib.pyplot as plt
 import os
 import sys
 
-# The plotting function is now internalized in generate_complex_plot, so we don't need the old import from visualization.py.
+# Project root goes first: experiments/src would otherwise shadow the top-level src package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.backends import get_backend
+from src.background_tiles import get_background
+from src.instrumentation import RunInstrumentation, run_report_path
+from src.results_store import load_results
 
+# The plotting function is now internalized in generate_complex_plot, so we don't need the old import from visualization.py.
 
-# --- UTILITY FUNCTIONS ---
-def calculate_mandelbrot_escape_time(c: complex, max_iter: int = 100, bailout: float = 2.0) -> int:
-    """Calculates the number of iterations before the sequence diverges."""
-    z = 0 + 0j
-    for i in range(max_iter):
-        z = z*z + c
-        if abs(z) > bailout:
-            return i
-    return max_iter 
 
 # --- NEW PLOTTING FUNCTION (Centralized Visualization Logic) ---
 def generate_complex_plot(
@@ -26,25 +23,21 @@ def generate_complex_plot(
     r_value: float, 
     title: str, 
     fig_id: str, 
-    script_dir: str
+    script_dir: str,
+    background_resolution=(400, 400),
+    background_max_iter: int = 50
 ):
     """
     Generates the Complex Plane plot with Mandelbrot overlay for a specific hypothesis.
+    Higher background_resolution / background_max_iter values are rendered once
+    in tiles across all cores and reused from the cache by later figures.
     """
     
-    # 1. Generate Mandelbrot Background 
-    h, w = 400, 400
-    y, x = np.ogrid[-1.5:1.5:h*1j, -2.5:1.5:w*1j]
-    c_grid = x + y*1j
-    z = c_grid
-    div_time = h + np.zeros(z.shape, dtype=int)
-
-    for i in range(50):
-        z = z**2 + c_grid
-        diverge = z * np.conj(z) > 4 # 2**2 = 4
-        div_now = diverge & (div_time == h) 
-        div_time[div_now] = i 
-        z[diverge] = 2 
+    # 1. Load Mandelbrot Background (computed once, then memory-mapped from data/cache/backgrounds)
+    h, w = background_resolution
+    div_time = get_background(extent=(-2.5, 1.5, -1.5, 1.5), resolution=(h, w), max_iter=background_max_iter,
+                              bailout=2.0, interior_value=h, workers=None,
+                              method='mariani_silver')
 
     # 2. Plotting Setup
     plt.figure(figsize=(12, 10))
@@ -108,118 +101,118 @@ def generate_complex_plot(
     print(f"✅ Generated Appendix Figure {fig_id} and saved to {save_path}")
 
 
-# --- MAPPING FUNCTIONS (Embedded - ORIGINAL FORMULAS) ---
-
-def map_params_to_complex_v1(A: int, B: int, C: int) -> complex:
-    """Hypothesis A / V1 Mapping: z = (B/A) + (C/A)i"""
-    if A == 0:
-        raise ValueError("Divisor 'A' cannot be zero.") 
-    return complex(B / A, C / A)
-
-def map_params_logarithmic(A: int, B: int, C: int) -> complex:
-    """Hypothesis B: Logarithmic Mapping"""
-    real_part = np.log(B / A) - 1.0 
-    imag_part = np.log(C / A) - 1.0
-    return complex(real_part, imag_part)
-
-def map_params_polar(A: int, B: int, C: int) -> complex:
-    """Hypothesis C: Polar/Trigonometric Mapping"""
-    r = (B + C) / A
-    theta = np.arctan(C / B) 
-    real_part = r * np.cos(theta)
-    imag_part = r * np.sin(theta)
-    return complex(real_part, imag_part)
-
-def map_params_reciprocal_products(A: int, B: int, C: int) -> complex:
-    """Hypothesis D: Reciprocal Products Mapping"""
-    return (1 / B) + (1 / (A * C)) * 1j
+# --- MAPPING FUNCTIONS ---
+# All mappings live in src/mapping_functions.py. Hypothesis D uses the appendix
+# variant 'reciprocal_appendix': z = 1/B + (1/(A*C))i.
+APPENDIX_MAPPINGS = {'v1': 'v1', 'log': 'log', 'polar': 'polar', 'reciprocal': 'reciprocal_appendix'}
 
 
 # --- MAIN EXECUTION FUNCTION ---
-def run_comparative_study():
+def run_comparative_study(backend=None, profile=False, trace_memory=False):
     """
     Loads Experiment 01 data, runs the correlation test, and generates all required plots.
+    backend: name or instance of a src/backends.py backend (None = configured default).
+    A JSON run report (stage times including plotting, escape-time counters) is
+    saved next to the CSV; profile / trace_memory add cProfile and tracemalloc output.
     """
-    print("--- SCRIPT STARTED. CHECKING ENVIRONMENT ---")
-
-    data_path = 'data/results/experiment_01_results.csv' 
-
-    try:
-        df_clean = pd.read_csv(data_path)
-        print(f"✅ Data loaded successfully from {data_path}. Total samples: {len(df_clean)}")
-    except FileNotFoundError as e:
-        absolute_check_path = os.path.abspath(data_path)
-        print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-        print(f"❌ FATAL ERROR: Data file not found. Please ensure the file is at this exact location: {absolute_check_path}")
-        print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-        raise e 
-
-    # --- 2. APPLY MAPPING HYPOTHESES & CALCULATE ET ---
-    print("\nApplying four different Collatz-to-Mandelbrot mappings and calculating Escape Times...")
-    
-    MAX_ITER = 100 
-    
-    df_clean['z_v1'] = df_clean.apply(lambda row: map_params_to_complex_v1(row['a_divisor'], row['b_multiplier'], row['c_adder']), axis=1)
-    df_clean['z_log'] = df_clean.apply(lambda row: map_params_logarithmic(row['a_divisor'], row['b_multiplier'], row['c_adder']), axis=1)
-    df_clean['z_polar'] = df_clean.apply(lambda row: map_params_polar(row['a_divisor'], row['b_multiplier'], row['c_adder']), axis=1)
-    df_clean['z_reciprocal'] = df_clean.apply(lambda row: map_params_reciprocal_products(row['a_divisor'], row['b_multiplier'], row['c_adder']), axis=1)
-
-    df_clean['escape_v1'] = df_clean['z_v1'].apply(lambda c: calculate_mandelbrot_escape_time(c, max_iter=MAX_ITER))
-    df_clean['escape_log'] = df_clean['z_log'].apply(lambda c: calculate_mandelbrot_escape_time(c, max_iter=MAX_ITER))
-    df_clean['escape_polar'] = df_clean['z_polar'].apply(lambda c: calculate_mandelbrot_escape_time(c, max_iter=MAX_ITER))
-    df_clean['escape_reciprocal'] = df_clean['z_reciprocal'].apply(lambda c: calculate_mandelbrot_escape_time(c, max_iter=MAX_ITER))
-
-    # --- 3. CALCULATE CORRELATIONS ---
-    print("\n--- Comparative Correlation Results ---")
-    
-    valid_data_v1 = df_clean.dropna(subset=['escape_v1'])
-    valid_data_log = df_clean.dropna(subset=['escape_log'])
-    valid_data_recip = df_clean.dropna(subset=['escape_reciprocal'])
-    
-    corr_v1, _ = pearsonr(valid_data_v1['collatz_conv_rate'], valid_data_v1['escape_v1'])
-    print(f"Hypothesis A (V1 Control):         r = {corr_v1:.4f}")
-
-    corr_log, _ = pearsonr(valid_data_log['collatz_conv_rate'], valid_data_log['escape_log'])
-    print(f"Hypothesis B (Logarithmic):        r = {corr_log:.4f}")
-
-    corr_polar, _ = pearsonr(df_clean['collatz_conv_rate'], df_clean['escape_polar'])
-    print(f"Hypothesis C (Polar/Trigonometric): r = {corr_polar:.4f}")
-
-    corr_recip, _ = pearsonr(valid_data_recip['collatz_conv_rate'], valid_data_recip['escape_reciprocal'])
-    print(f"Hypothesis D (Reciprocal Products): r = {corr_recip:.4f}")
-    
-    # --- 4. GENERATE VISUALIZATIONS (A1, A2, A3, C-ALT) ---
-    print("\nGenerating Figures (A1, A2, A3) and Test Figure C-ALT...") 
-    
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-
-    # *** FIGURE C-ALT PLOT (Main Finding/Visualization Test) ***
-    generate_complex_plot(
-        df=df_clean, z_column='z_polar', ccr_column='collatz_conv_rate', 
-        r_value=corr_polar, 
-        title='Figure C-ALT: Hypothesis C (Polar Mapping) Visualization Test', 
-        fig_id='C-ALT', 
-        script_dir=script_dir
-    )
-    
-    # Hypothesis A (V1 Control) - Figure A1
-    generate_complex_plot(
-        df=valid_data_v1, z_column='z_v1', ccr_column='collatz_conv_rate', 
-        r_value=corr_v1, title='Appendix Figure A1: Hypothesis A (V1 Control - V1 Mapping)', fig_id='A1', script_dir=script_dir
-    )
-    
-    # Hypothesis B (Logarithmic) - Figure A2
-    generate_complex_plot(
-        df=valid_data_log, z_column='z_log', ccr_column='collatz_conv_rate', 
-        r_value=corr_log, title='Appendix Figure A2: Hypothesis B (Logarithmic Mapping)', fig_id='A2', script_dir=script_dir
-    )
-
-    # Hypothesis D (Reciprocal Products) - Figure A3
-    generate_complex_plot(
-        df=valid_data_recip, z_column='z_reciprocal', ccr_column='collatz_conv_rate', 
-        r_value=corr_recip, title='Appendix Figure A3: Hypothesis D (Reciprocal Products Mapping)', fig_id='A3', script_dir=script_dir
-    )
-    print("✅ All required Figures generated and saved to the 'experiments' folder.")
+    backend = get_backend(backend)
+    instrumentation = RunInstrumentation('appendix_machine', profile=profile, trace_memory=trace_memory)
+    instrumentation.metadata.update(backend=backend.name, mappings=dict(APPENDIX_MAPPINGS))
+    with instrumentation:
+        print("--- SCRIPT STARTED. CHECKING ENVIRONMENT ---")
+
+        data_path = 'data/results/experiment_01_results.csv' 
+
+        try:
+            # Only the Experiment 01 columns are needed; every z_/escape_ column is recomputed below
+            with instrumentation.stage('load_results'):
+                df_clean = load_results(data_path, columns=['a_divisor', 'b_multiplier', 'c_adder', 'collatz_conv_rate'])
+            print(f"✅ Data loaded successfully from {data_path}. Total samples: {len(df_clean)}")
+        except FileNotFoundError as e:
+            absolute_check_path = os.path.abspath(data_path)
+            print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+            print(f"❌ FATAL ERROR: Data file not found. Please ensure the file is at this exact location: {absolute_check_path}")
+            print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
+            raise e 
+
+        # --- 2. APPLY MAPPING HYPOTHESES & CALCULATE ET ---
+        print("\nApplying four different Collatz-to-Mandelbrot mappings and calculating Escape Times...")
+    
+        MAX_ITER = 100 
+    
+        a = df_clean['a_divisor'].to_numpy()
+        b = df_clean['b_multiplier'].to_numpy()
+        c = df_clean['c_adder'].to_numpy()
+
+        with instrumentation.stage('mapping'):
+            for column, mapping_name in APPENDIX_MAPPINGS.items():
+                df_clean[f'z_{column}'] = backend.map_params(mapping_name, a, b, c)
+
+        # 'update_first' keeps the appendix's original counting (update z, then test the bailout)
+        with instrumentation.stage('escape_time'):
+            for column in APPENDIX_MAPPINGS:
+                df_clean[f'escape_{column}'] = backend.escape_time(
+                    df_clean[f'z_{column}'].to_numpy(), max_iter=MAX_ITER, bailout=2.0, convention='update_first'
+                )
+        for column in APPENDIX_MAPPINGS:
+            instrumentation.record_escape_times(df_clean[f'escape_{column}'], MAX_ITER)
+
+        # --- 3. CALCULATE CORRELATIONS ---
+        print("\n--- Comparative Correlation Results ---")
+    
+        with instrumentation.stage('correlation'):
+            valid_data_v1 = df_clean.dropna(subset=['escape_v1'])
+            valid_data_log = df_clean.dropna(subset=['escape_log'])
+            valid_data_recip = df_clean.dropna(subset=['escape_reciprocal'])
+    
+            corr_v1, _ = pearsonr(valid_data_v1['collatz_conv_rate'], valid_data_v1['escape_v1'])
+            print(f"Hypothesis A (V1 Control):         r = {corr_v1:.4f}")
+
+            corr_log, _ = pearsonr(valid_data_log['collatz_conv_rate'], valid_data_log['escape_log'])
+            print(f"Hypothesis B (Logarithmic):        r = {corr_log:.4f}")
+
+            corr_polar, _ = pearsonr(df_clean['collatz_conv_rate'], df_clean['escape_polar'])
+            print(f"Hypothesis C (Polar/Trigonometric): r = {corr_polar:.4f}")
+
+            corr_recip, _ = pearsonr(valid_data_recip['collatz_conv_rate'], valid_data_recip['escape_reciprocal'])
+            print(f"Hypothesis D (Reciprocal Products): r = {corr_recip:.4f}")
+    
+        # --- 4. GENERATE VISUALIZATIONS (A1, A2, A3, C-ALT) ---
+        print("\nGenerating Figures (A1, A2, A3) and Test Figure C-ALT...") 
+    
+        with instrumentation.stage('plotting'):
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+
+            # *** FIGURE C-ALT PLOT (Main Finding/Visualization Test) ***
+            generate_complex_plot(
+                df=df_clean, z_column='z_polar', ccr_column='collatz_conv_rate', 
+                r_value=corr_polar, 
+                title='Figure C-ALT: Hypothesis C (Polar Mapping) Visualization Test', 
+                fig_id='C-ALT', 
+                script_dir=script_dir
+            )
+    
+            # Hypothesis A (V1 Control) - Figure A1
+            generate_complex_plot(
+                df=valid_data_v1, z_column='z_v1', ccr_column='collatz_conv_rate', 
+                r_value=corr_v1, title='Appendix Figure A1: Hypothesis A (V1 Control - V1 Mapping)', fig_id='A1', script_dir=script_dir
+            )
+    
+            # Hypothesis B (Logarithmic) - Figure A2
+            generate_complex_plot(
+                df=valid_data_log, z_column='z_log', ccr_column='collatz_conv_rate', 
+                r_value=corr_log, title='Appendix Figure A2: Hypothesis B (Logarithmic Mapping)', fig_id='A2', script_dir=script_dir
+            )
+
+            # Hypothesis D (Reciprocal Products) - Figure A3
+            generate_complex_plot(
+                df=valid_data_recip, z_column='z_reciprocal', ccr_column='collatz_conv_rate', 
+                r_value=corr_recip, title='Appendix Figure A3: Hypothesis D (Reciprocal Products Mapping)', fig_id='A3', script_dir=script_dir
+            )
+        print("✅ All required Figures generated and saved to the 'experiments' folder.")
+
+    report_path = instrumentation.write_report(run_report_path(data_path, 'appendix_machine'))
+    print(f"✅ Run report saved to {report_path}")
 
 
 if __name__ == "__main__":
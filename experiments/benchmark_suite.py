@@ -0,0 +1,299 @@
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Put the project root first so the root src/ package wins over experiments/src
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT_DIR)
+
+from src.collatz_generators import generalized_collatz
+from src.collatz_metrics import measure_collatz_behavior
+from src.mandelbrot_utils import mandelbrot_escape_time, escape_time_array
+from src.julia_sets import julia_metrics
+from src.mapping_functions import study_mappings
+
+BENCHMARK_DIR = os.path.join(ROOT_DIR, 'data', 'benchmarks')
+DEFAULT_BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'baseline.json')
+
+# A benchmark slower than baseline by more than this fraction is flagged
+DEFAULT_THRESHOLD = 0.10
+
+# Parameter sets for the Collatz kernels: one per kind of final behavior
+COLLATZ_CASES = {
+    'standard': (2, 3, 1),    # every start converges to 1
+    'cycling': (2, 3, 5),     # most starts fall into cycles that avoid 1
+    'diverging': (3, 4, 1),   # every start passes the divergence bound
+}
+
+
+# --- BENCHMARK CASES ---
+# Each case is a setup function taking a scale factor (1 for full runs, smaller
+# for --quick) and returning the zero-argument callable that gets timed.
+
+def _collatz_case(params):
+    def setup(scale):
+        starts = range(1, int(2000 * scale) + 1)
+        return lambda: [generalized_collatz(n, *params) for n in starts]
+    return setup
+
+
+def _measure_case(range_end, engine):
+    def setup(scale):
+        test_range = (1, max(2, int(range_end * scale)))
+        return lambda: [measure_collatz_behavior(*params, test_range=test_range, engine=engine)
+                        for params in COLLATZ_CASES.values()]
+    return setup
+
+
+def _sieve_case(scale):
+    # Large range for the standard map, where the residue sieve is meant to pay off
+    test_range = (1, int(1000000 * scale))
+    return lambda: measure_collatz_behavior(*COLLATZ_CASES['standard'], test_range=test_range, engine='sieve')
+
+
+def _interior_points(count):
+    # Points well inside the main cardioid: they never escape, so every one runs the full max_iter
+    rng = np.random.default_rng(0)
+    radius = 0.2 * np.sqrt(rng.random(count))
+    angle = 2 * np.pi * rng.random(count)
+    return -0.1 + radius * np.exp(1j * angle)
+
+
+def _exterior_points(count):
+    # Points to the right of the set: they escape within a few iterations
+    rng = np.random.default_rng(0)
+    return rng.uniform(0.4, 1.0, count) + 1j * rng.uniform(-1.0, 1.0, count)
+
+
+def _escape_scalar_case(make_points):
+    def setup(scale):
+        points = [complex(p) for p in make_points(int(200 * scale))]
+        return lambda: [mandelbrot_escape_time(p, max_iter=1000, interior_check=False) for p in points]
+    return setup
+
+
+def _escape_array_case(make_points):
+    def setup(scale):
+        points = make_points(int(100000 * scale))
+        return lambda: escape_time_array(points, max_iter=1000, interior_check=False)
+    return setup
+
+
+def _julia_case(scale):
+    # Parameters around the Mandelbrot set: a mix of connected and dust-like Julia sets
+    rng = np.random.default_rng(0)
+    count = max(1, int(1000 * scale))
+    params = rng.normal(-0.3, 0.6, count) + 1j * rng.normal(0.0, 0.6, count)
+    return lambda: julia_metrics(params, resolution=64, max_iter=100)
+
+
+def _mapping_case(func):
+    def setup(scale):
+        rng = np.random.default_rng(0)
+        size = int(1000000 * scale)
+        a = rng.integers(2, 11, size)
+        b = rng.integers(1, 11, size)
+        c = rng.integers(1, 11, size)
+        return lambda: func(a, b, c)
+    return setup
+
+
+def _run_experiment_case(scale):
+    from experiments.experiment_01_basic_mapping import run_experiment
+    num_samples = max(1, int(100 * scale))
+
+    def run():
+        # run_experiment writes ../data/results relative to the working directory and
+        # logs every sample, so it runs in a scratch directory with its output discarded
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as scratch:
+            os.makedirs(os.path.join(scratch, 'work'))
+            os.chdir(os.path.join(scratch, 'work'))
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    run_experiment(num_samples=num_samples, seed=0, workers=1,
+                                   max_iterations=5000, store_path=None,
+                                   checkpoint_dir=os.path.join(scratch, 'checkpoint'))
+            finally:
+                os.chdir(cwd)
+    return run
+
+
+BENCHMARKS = {}
+for _case, _params in COLLATZ_CASES.items():
+    BENCHMARKS[f'generalized_collatz.{_case}'] = _collatz_case(_params)
+for _range_end in (50, 500, 5000):
+    for _engine in ('python', 'jump', 'numpy'):
+        BENCHMARKS[f'measure_collatz_behavior.{_engine}.n{_range_end}'] = _measure_case(_range_end, _engine)
+BENCHMARKS['measure_collatz_behavior.sieve.n1000000'] = _sieve_case
+BENCHMARKS['escape_time.scalar.interior'] = _escape_scalar_case(_interior_points)
+BENCHMARKS['escape_time.scalar.exterior'] = _escape_scalar_case(_exterior_points)
+BENCHMARKS['escape_time.array.interior'] = _escape_array_case(_interior_points)
+BENCHMARKS['escape_time.array.exterior'] = _escape_array_case(_exterior_points)
+BENCHMARKS['julia_metrics.p1000'] = _julia_case
+for _name, _mapping in study_mappings().items():
+    BENCHMARKS[f'mapping.{_name}'] = _mapping_case(_mapping['func'])
+BENCHMARKS['run_experiment'] = _run_experiment_case
+
+
+# --- RUNNING ---
+
+def machine_metadata():
+    """Where and with what a benchmark run was made, so results are only compared like for like."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'hostname': platform.node(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python_version': platform.python_version(),
+        'numpy_version': np.__version__,
+        'git_commit': commit,
+    }
+
+
+def time_benchmark(func, repeat=5):
+    """Runs func repeat times (after one warm-up call); returns the timings in seconds."""
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_benchmarks(names=None, repeat=5, quick=False):
+    """
+    Times every benchmark in BENCHMARKS (or only those whose name starts with
+    one of names). quick=True shrinks every workload tenfold.
+    Returns {'metadata': ..., 'settings': ..., 'results': {name: stats}}.
+    """
+    scale = 0.1 if quick else 1.0
+    selected = [name for name in BENCHMARKS
+                if not names or any(name.startswith(prefix) for prefix in names)]
+
+    results = {}
+    for name in selected:
+        timings = time_benchmark(BENCHMARKS[name](scale), repeat)
+        results[name] = {
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'mean': statistics.mean(timings),
+            'timings': timings,
+        }
+        print(f"{name.ljust(44)} median {results[name]['median'] * 1000:10.2f} ms")
+
+    return {
+        'metadata': machine_metadata(),
+        'settings': {'repeat': repeat, 'quick': quick},
+        'results': results,
+    }
+
+
+def compare_benchmarks(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares two benchmark reports on their fastest timing (the least noisy statistic).
+    Returns one row per benchmark present in both, with the current/baseline
+    ratio and whether it is a regression (ratio above 1 + threshold).
+    """
+    rows = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        ratio = result['min'] / baseline['results'][name]['min']
+        rows.append({
+            'name': name,
+            'baseline': baseline['results'][name]['min'],
+            'current': result['min'],
+            'ratio': ratio,
+            'regression': ratio > 1 + threshold,
+        })
+    return rows
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save(report, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Benchmark results saved to {path}")
+
+
+def _print_comparison(rows, current, baseline):
+    for key in ('hostname', 'platform', 'python_version', 'numpy_version'):
+        if current['metadata'].get(key) != baseline['metadata'].get(key):
+            print(f"⚠️  {key} differs from baseline: "
+                  f"{baseline['metadata'].get(key)} -> {current['metadata'].get(key)}")
+    if current['settings']['quick'] != baseline['settings']['quick']:
+        print("⚠️  one report used --quick workloads and the other did not; timings are not comparable")
+
+    for row in rows:
+        flag = 'SLOWER' if row['regression'] else ''
+        print(f"{row['name'].ljust(44)} {row['baseline'] * 1000:10.2f} ms -> "
+              f"{row['current'] * 1000:10.2f} ms  x{row['ratio']:.2f} {flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks for the Collatz and Mandelbrot kernels.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="time the benchmarks and save a JSON report")
+    run_parser.add_argument('names', nargs='*', help="only run benchmarks starting with these prefixes")
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--quick', action='store_true', help="tenfold smaller workloads")
+    run_parser.add_argument('--output', help="report path (default: data/benchmarks/benchmark_<time>.json)")
+    run_parser.add_argument('--save-baseline', action='store_true',
+                            help="also store the report as the baseline")
+
+    compare_parser = commands.add_parser('compare', help="flag slowdowns of a report against the baseline")
+    compare_parser.add_argument('report')
+    compare_parser.add_argument('--baseline', default=DEFAULT_BASELINE_PATH)
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help="allowed slowdown as a fraction (default 0.10)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run_benchmarks(args.names, args.repeat, args.quick)
+        stamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        _save(report, args.output or os.path.join(BENCHMARK_DIR, f'benchmark_{stamp}.json'))
+        if args.save_baseline:
+            _save(report, DEFAULT_BASELINE_PATH)
+        return 0
+
+    current, baseline = _load(args.report), _load(args.baseline)
+    rows = compare_benchmarks(current, baseline, args.threshold)
+    _print_comparison(rows, current, baseline)
+    regressions = [row['name'] for row in rows if row['regression']]
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+        return 1
+    print(f"\n✅ No benchmark slower than baseline by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,64 +7,102 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import your core analysis modules
-from src.collatz_metrics import measure_collatz_behavior
-from src.mandelbrot_utils import is_in_mandelbrot_set, mandelbrot_escape_time
-from src.mapping_functions import map_params_to_complex_v1
+from src.parameter_sweep import grid_parameters, sample_parameters, run_parameter_sweep
+from src.metrics_store import DEFAULT_STORE_PATH, METRICS_CODE_VERSION
+from src.backends import get_backend
+from src.instrumentation import RunInstrumentation, run_report_path
+from src.results_store import save_results
+from src.sweep_checkpoint import DEFAULT_CHECKPOINT_DIR, SweepCheckpoint
 
-def run_experiment():
-    data = []
-    num_samples = 100
-    
-    print("Starting Experiment 01: Collatz-Mandelbrot Parameter Correlation")
-    print("-" * 50)
-    
-    for i in range(num_samples):
-        # 1. Define Random Parameters (A=Divisor, B=Multiplier, C=Adder)
-        # Using a restricted range for initial exploration
-        a = np.random.randint(2, 11)   # Divisor: 2-10
-        b = np.random.randint(1, 11)   # Multiplier: 1-10
-        c = np.random.randint(1, 11)   # Adder: 1-10
+def run_experiment(num_samples=100, seed=None, grid=False, workers=None, backend=None, test_range=(1, 50), max_iterations=1000000, store_path=DEFAULT_STORE_PATH,
+                   profile=False, trace_memory=False, checkpoint_dir=DEFAULT_CHECKPOINT_DIR, checkpoint_interval=60.0,
+                   overwrite_checkpoint=False):
+    """
+    Experiment 01: samples (a, b, c) triples (or the full grid with grid=True),
+    evaluates them across a process pool and saves the results CSV.
+    seed makes the sampled triples reproducible; workers=None uses every core.
+    Collatz metrics are looked up in (and added to) the store at store_path;
+    pass store_path=None to always recompute.
+    backend: src/backends.py backend whose Collatz engine is used (None = configured default).
+    A JSON run report (stage times, Collatz/escape counters, slowest parameter
+    sets) is saved next to the CSV; profile / trace_memory add cProfile and
+    tracemalloc output to it.
+    Finished rows are checkpointed to checkpoint_dir at least every
+    checkpoint_interval seconds. Rerunning with the same settings after an
+    interruption resumes that sweep and only evaluates the missing triples
+    (seed=None picks up the interrupted sweep's seed); checkpoint_dir=None
+    disables checkpointing. An unfinished sweep with other settings in
+    checkpoint_dir raises ValueError unless overwrite_checkpoint=True.
+    """
+    checkpoint = SweepCheckpoint(checkpoint_dir) if checkpoint_dir is not None else None
+    backend = get_backend(backend)
+    instrumentation = RunInstrumentation('experiment_01', profile=profile, trace_memory=trace_memory)
+    with instrumentation:
+        print("Starting Experiment 01: Collatz-Mandelbrot Parameter Correlation")
+        print("-" * 50)
         
-        # 2. Measure Collatz Behavior
-        col_metrics = measure_collatz_behavior(a, b, c, test_range=(1, 50))
+        # 1. Define Parameters (A=Divisor, B=Multiplier, C=Adder)
+        # Using a restricted range for initial exploration (A: 2-10, B: 1-10, C: 1-10)
+        with instrumentation.stage('parameters'):
+            if grid:
+                params = grid_parameters()
+            else:
+                if seed is None and checkpoint is not None:
+                    manifest = checkpoint.resumable(_checkpoint_config(num_samples, None, grid, test_range,
+                                                                       max_iterations, backend))
+                    if manifest is not None:
+                        seed = manifest['config']['seed']
+                if seed is None:
+                    seed = np.random.SeedSequence().entropy
+                print(f"Sampling seed: {seed}")
+                params = sample_parameters(num_samples, seed)
+        instrumentation.metadata.update(num_samples=len(params), seed=seed, grid=grid, backend=backend.name,
+                                        test_range=list(test_range), max_iterations=max_iterations)
+        if checkpoint is not None:
+            config = _checkpoint_config(num_samples, None if grid else seed, grid, test_range, max_iterations, backend)
+            if checkpoint.start(config, overwrite=overwrite_checkpoint):
+                print(f"Resuming interrupted sweep from {checkpoint.path} "
+                      f"({checkpoint.load_manifest()['rows_done']} parameter sets already done)")
+            instrumentation.metadata['checkpoint'] = checkpoint.path
         
-        # 3. Map to Complex Plane
-        # z = (b/a) + (c/a)i
-        z_point = map_params_to_complex_v1(a, b, c)
+        # 2-4. Collatz behavior, complex mapping and Mandelbrot status for every triple
+        with instrumentation.stage('parameter_sweep'):
+            data = run_parameter_sweep(params, test_range=test_range, max_iterations=max_iterations, engine=backend.collatz_engine_for(test_range), workers=workers, store_path=store_path,
+                                       instrumentation=instrumentation, checkpoint=checkpoint,
+                                       checkpoint_interval=checkpoint_interval)
         
-        # 4. Check Mandelbrot Status
-        in_mandelbrot = is_in_mandelbrot_set(z_point)
-        escape_speed = mandelbrot_escape_time(z_point)
+        for i, row in enumerate(data):
+            print(f"Sample {i+1}/{len(data)}: (a,b,c)=({row['a_divisor']},{row['b_multiplier']},{row['c_adder']}) | Conv Rate: {row['collatz_conv_rate']:.2f} | Complex: {row['complex_real']:.2f} + {row['complex_imag']:.2f}i")
+            
+        # Save Results
+        with instrumentation.stage('save_results'):
+            df = pd.DataFrame(data)
+            
+            # Ensure the results directory exists
+            results_dir = '../data/results'
+            os.makedirs(results_dir, exist_ok=True)
+            output_path = os.path.join(results_dir, 'experiment_01_results.csv')
+            # Columnar store (read by the later experiments) plus the CSV export
+            save_results(df, output_path)
         
-        data.append({
-            'a_divisor': a, 
-            'b_multiplier': b, 
-            'c_adder': c,
-            'collatz_conv_rate': col_metrics['convergence_rate'],
-            'avg_steps': col_metrics['avg_steps_to_one'],
-            'complex_real': z_point.real,
-            'complex_imag': z_point.imag,
-            'in_mandelbrot': in_mandelbrot,
-            'escape_time': escape_speed
-        })
+        if checkpoint is not None:
+            checkpoint.finish()
+        print("\nExperiment Complete. Data saved to:", output_path)
         
-        print(f"Sample {i+1}/{num_samples}: (a,b,c)=({a},{b},{c}) | Conv Rate: {col_metrics['convergence_rate']:.2f} | Complex: {z_point.real:.2f} + {z_point.imag:.2f}i")
-        
-    # Save Results
-    df = pd.DataFrame(data)
-    
-    # Ensure the results directory exists
-    results_dir = '../data/results'
-    os.makedirs(results_dir, exist_ok=True)
-    output_path = os.path.join(results_dir, 'experiment_01_results.csv')
-    df.to_csv(output_path, index=False)
-    
-    print("\nExperiment Complete. Data saved to:", output_path)
-    
-    # Calculate and print the key correlation
-    correlation = df['collatz_conv_rate'].corr(df['escape_time'])
-    print(f"Primary Result: Correlation between Collatz Convergence Rate and Mandelbrot Escape Time: {correlation:.4f}")
-    print("-" * 50)
+        # Calculate and print the key correlation
+        with instrumentation.stage('correlation'):
+            correlation = df['collatz_conv_rate'].corr(df['escape_time'])
+        print(f"Primary Result: Correlation between Collatz Convergence Rate and Mandelbrot Escape Time: {correlation:.4f}")
+        print("-" * 50)
+
+    report_path = instrumentation.write_report(run_report_path(output_path, 'experiment_01'))
+    print("Run report saved to:", report_path)
+
+def _checkpoint_config(num_samples, seed, grid, test_range, max_iterations, backend):
+    # Everything that decides which triples are evaluated and what their rows contain
+    return {'seed': seed, 'num_samples': None if grid else num_samples, 'grid': grid,
+            'test_range': list(test_range), 'max_iterations': max_iterations,
+            'engine': backend.collatz_engine_for(test_range), 'metrics_code_version': METRICS_CODE_VERSION}
 
 if __name__ == "__main__":
     run_experiment()
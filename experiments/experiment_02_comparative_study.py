@@ -2,114 +2,206 @@ import pandas as pd
 from scipy.stats import pearsonr
 import numpy as np # Needed for the map_params_polar and map_params_logarithmic functions
 # Add these three lines near the top of your script
+import contextlib
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-# --- ASSUMED UTILITY FUNCTIONS ---
-# This is a standard Mandelbrot calculation function (from the original experiment)
-def calculate_mandelbrot_escape_time(c: complex, max_iter: int = 100, bailout: float = 2.0) -> int:
-    """Calculates the number of iterations before the sequence diverges."""
-    z = 0 + 0j
-    for i in range(max_iter):
-        z = z*z + c
-        if abs(z) > bailout:
-            # Return i (the number of steps taken before divergence)
-            return i
-    # Return max_iter if the sequence did not diverge (bounded)
-    return max_iter 
-
-# --- IMPORT ALL FOUR MAPPING HYPOTHESES ---
-# NOTE: Ensure these functions are correctly defined in src/mapping_functions.py
-from src.mapping_functions import (
-    map_params_to_complex_v1,      # Hypothesis A
-    map_params_logarithmic,        # Hypothesis B
-    map_params_polar,              # Hypothesis C
-    map_params_reciprocal_products # Hypothesis D
-)
-
-def run_comparative_study():
+# --- ESCAPE TIME ---
+# 'update_first' keeps this study's original counting (z is updated before the bailout test).
+ESCAPE_MAX_ITER = 100
+ESCAPE_BAILOUT = 2.0
+ESCAPE_CONVENTION = 'update_first'
+
+# --- FILLED JULIA SETS ---
+# Grid and iteration limit of the optional Julia hypotheses (julia=True)
+JULIA_RESOLUTION = 64
+JULIA_MAX_ITER = 100
+
+# --- MAPPING HYPOTHESES AND KERNELS ---
+# Hypotheses A-D (v1, log, polar, reciprocal) are registered in src/mapping_functions.py;
+# any mapping registered there with study=True is picked up automatically.
+# Mapping and escape-time kernels run on the backend picked by src/backends.py
+# (argument, COLLATZ_MANDELBROT_BACKEND environment variable, or the default).
+from src.mapping_functions import study_mappings
+from src.backends import get_backend
+from src.instrumentation import RunInstrumentation, run_report_path
+from src.results_store import current_store, load_results, save_results
+from src.correlation_stats import correlation_significance
+from src.julia_sets import julia_metrics
+
+def update_hypothesis_columns(store, mappings, backend, incremental=True, instrumentation=None):
+    """
+    Brings the z_<name> / escape_<name> columns of every mapping up to date in
+    the results store and commits them in a single atomic write.
+
+    Each (part, column) records the settings it was computed with. With
+    incremental=True only the parts whose column is missing or was computed
+    with other settings (another mapping, escape max_iter, bailout or
+    convention) are recomputed; an escape column is also redone when its z
+    column is. incremental=False recomputes everything.
+    Returns the number of rows recomputed per mapping.
+    """
+    escape_settings = {'max_iter': ESCAPE_MAX_ITER, 'bailout': ESCAPE_BAILOUT, 'convention': ESCAPE_CONVENTION}
+    updates, meta, recomputed = {}, {}, {}
+    params_by_part = {}
+
+    for name in mappings:
+        z_column, escape_column = f'z_{name}', f'escape_{name}'
+        meta[z_column] = {'mapping': name}
+        meta[escape_column] = {'mapping': name, **escape_settings}
+        recomputed[name] = 0
+
+        for part in range(store.num_parts):
+            z_fresh = incremental and store.column_meta(part, z_column) == meta[z_column]
+            if z_fresh and store.column_meta(part, escape_column) == meta[escape_column]:
+                continue
+            part_updates = updates.setdefault(part, {})
+
+            if z_fresh:
+                z = store.read_column(z_column, parts=[part])
+            else:
+                if part not in params_by_part:
+                    params_by_part[part] = [store.read_column(column, parts=[part])
+                                            for column in ('a_divisor', 'b_multiplier', 'c_adder')]
+                with _stage(instrumentation, 'mapping'):
+                    z = backend.map_params(name, *params_by_part[part])
+                part_updates[z_column] = z
+
+            with _stage(instrumentation, 'escape_time'):
+                escape = backend.escape_time(z, max_iter=ESCAPE_MAX_ITER, bailout=ESCAPE_BAILOUT,
+                                             convention=ESCAPE_CONVENTION)
+            part_updates[escape_column] = escape
+            recomputed[name] += len(escape)
+            if instrumentation is not None:
+                instrumentation.record_escape_times(escape, ESCAPE_MAX_ITER)
+
+    if updates:
+        store.write_part_columns(updates, meta)
+    return recomputed
+
+
+def _stage(instrumentation, name):
+    return instrumentation.stage(name) if instrumentation is not None else contextlib.nullcontext()
+
+
+def run_comparative_study(backend=None, profile=False, trace_memory=False, export_csv=False, incremental=True,
+                          n_resamples=10000, significance_workers=1, significance_seed=0, julia=False,
+                          julia_workers=1):
     """
     Loads Experiment 01 data and runs the correlation test against 
-    four different Mandelbrot parameter mappings.
+    every Mandelbrot parameter mapping in the study registry.
+    backend: name or instance of a src/backends.py backend (None = configured default).
+    A JSON run report (stage times, escape-time counters) is saved next to the
+    CSV; profile / trace_memory add cProfile and tracemalloc output to it.
+    Results are read from and written to the columnar store next to the CSV
+    (src/results_store.py); a CSV-only dataset is imported into a store first.
+    incremental=True only computes hypothesis columns that are missing or
+    stale (see update_hypothesis_columns); False recomputes them all.
+    export_csv=True also rewrites the CSV with every column.
+    n_resamples permutations and bootstrap resamples test every hypothesis at
+    once (src/correlation_stats.py), spread over significance_workers
+    processes; 0 skips the significance stage.
+    julia=True also correlates the interior fraction of each mapped
+    parameter's filled Julia set (src/julia_sets.py, julia_workers processes)
+    and includes those series in the significance stage.
     """
-    try:
-        # 1. Load the clean Collatz data
-        data_path = 'data/results/experiment_01_results.csv'
-        df_clean = pd.read_csv(data_path)
-        print(f"✅ Data loaded successfully from {data_path}. Total samples: {len(df_clean)}")
+    backend = get_backend(backend)
+    mappings = study_mappings()
+    instrumentation = RunInstrumentation('experiment_02', profile=profile, trace_memory=trace_memory)
+    instrumentation.metadata.update(backend=backend.name, mappings=list(mappings), escape_max_iter=ESCAPE_MAX_ITER,
+                                    incremental=incremental, n_resamples=n_resamples, julia=julia)
+    with instrumentation:
+        try:
+            # 1. Load the clean Collatz data
+            data_path = 'data/results/experiment_01_results.csv'
+            with instrumentation.stage('load_results'):
+                store = current_store(data_path)
+                if store is None:
+                    # First run on a CSV-only dataset: import it into a columnar store
+                    store = save_results(load_results(data_path), data_path, export_csv=False)
+            print(f"✅ Data loaded successfully from {data_path}. Total samples: {len(store)}")
+            
+        except FileNotFoundError:
+            print("❌ ERROR: The file 'data/results/experiment_01_results.csv' was not found.")
+            print("Please ensure you have saved the clean 100-sample CSV content there.")
+            return
+
+        # --- 2-3. APPLY MAPPING HYPOTHESES AND CALCULATE MANDELBROT ESCAPE TIMES ---
+        print(f"\nApplying {len(mappings)} different Collatz-to-Mandelbrot mappings...")
+        print("Calculating Mandelbrot Escape Time for all hypotheses...")
+
+        # Only missing or stale columns are computed; all of them are committed together
+        recomputed = update_hypothesis_columns(store, mappings, backend, incremental, instrumentation)
+        for name, rows in recomputed.items():
+            instrumentation.count(f'rows_recomputed_{name}', rows)
+        print(f"Recomputed rows per hypothesis: {recomputed}")
+
+        # --- 4. CALCULATE AND PRINT CORRELATIONS ---
+        print("\n--- Comparative Correlation Results ---")
         
-    except FileNotFoundError:
-        print("❌ ERROR: The file 'data/results/experiment_01_results.csv' was not found.")
-        print("Please ensure you have saved the clean 100-sample CSV content there.")
-        return
-
-    # --- 2. APPLY MAPPING HYPOTHESES ---
-    print("\nApplying four different Collatz-to-Mandelbrot mappings...")
-    
-    # Hypothesis A (V1 - Control)
-    df_clean['z_v1'] = df_clean.apply(
-        lambda row: map_params_to_complex_v1(row['a_divisor'], row['b_multiplier'], row['c_adder']), axis=1
-    )
-
-    # Hypothesis B (Logarithmic)
-    df_clean['z_log'] = df_clean.apply(
-        lambda row: map_params_logarithmic(row['a_divisor'], row['b_multiplier'], row['c_adder']), axis=1
-    )
-
-    # Hypothesis C (Polar/Trigonometric)
-    df_clean['z_polar'] = df_clean.apply(
-        lambda row: map_params_polar(row['a_divisor'], row['b_multiplier'], row['c_adder']), axis=1
-    )
-
-    # Hypothesis D (Reciprocal Products)
-    df_clean['z_reciprocal'] = df_clean.apply(
-        lambda row: map_params_reciprocal_products(row['a_divisor'], row['b_multiplier'], row['c_adder']), axis=1
-    )
-
-    # --- 3. CALCULATE MANDELBROT ESCAPE TIMES ---
-    print("Calculating Mandelbrot Escape Time for all four hypotheses...")
-    
-    df_clean['escape_v1'] = df_clean['z_v1'].apply(calculate_mandelbrot_escape_time)
-    df_clean['escape_log'] = df_clean['z_log'].apply(calculate_mandelbrot_escape_time)
-    df_clean['escape_polar'] = df_clean['z_polar'].apply(calculate_mandelbrot_escape_time)
-    df_clean['escape_reciprocal'] = df_clean['z_reciprocal'].apply(calculate_mandelbrot_escape_time)
-
-    # --- 4. CALCULATE AND PRINT CORRELATIONS ---
-    print("\n--- Comparative Correlation Results ---")
-    
-    collatz_rates = df_clean['collatz_conv_rate']
-
-    corr_v1, _ = pearsonr(collatz_rates, df_clean['escape_v1'])
-    print(f"Hypothesis A (V1 Control):         r = {corr_v1:.4f}")
-
-    corr_log, _ = pearsonr(collatz_rates, df_clean['escape_log'])
-    print(f"Hypothesis B (Logarithmic):        r = {corr_log:.4f}")
-
-    corr_polar, _ = pearsonr(collatz_rates, df_clean['escape_polar'])
-    print(f"Hypothesis C (Polar/Trigonometric): r = {corr_polar:.4f}")
-
-    corr_recip, _ = pearsonr(collatz_rates, df_clean['escape_reciprocal'])
-    print(f"Hypothesis D (Reciprocal Products): r = {corr_recip:.4f}")
-
-    # Determine the best hypothesis
-    correlations = {
-        'A (V1 Control)': abs(corr_v1),
-        'B (Logarithmic)': abs(corr_log),
-        'C (Polar/Trigonometric)': abs(corr_polar),
-        'D (Reciprocal Products)': abs(corr_recip),
-    }
-    best_hypothesis = max(correlations, key=correlations.get)
-    best_r = correlations[best_hypothesis]
-
-    print("\n-------------------------------------")
-    print(f"🏆 Best Correlation Found: {best_hypothesis} (r = {best_r:.4f})")
-    print("-------------------------------------") 
-    # Add these lines to experiment_02_comparative_study.py
-    # -----------------------------------------------------
-    df_clean.to_csv(data_path, index=False)
-    print(f"✅ Updated data saved successfully to {data_path} with new columns (z_polar, escape_polar, etc.).")
-    # -----------------------------------------------------
+        with instrumentation.stage('load_results'):
+            df_clean = store.read(['collatz_conv_rate'] + [f'escape_{name}' for name in mappings]
+                                  + ([f'z_{name}' for name in mappings] if julia else []))
+        collatz_rates = df_clean['collatz_conv_rate']
+        labels = {name: 'Hypothesis ' + mapping['label'] for name, mapping in mappings.items()}
+        series = {name: df_clean[f'escape_{name}'] for name in mappings}
+
+        # Determine the best hypothesis
+        correlations = {}
+        with instrumentation.stage('correlation'):
+            for name, mapping in mappings.items():
+                corr, _ = pearsonr(collatz_rates, df_clean[f'escape_{name}'])
+                print(f"{('Hypothesis ' + mapping['label'] + ':').ljust(34)} r = {corr:.4f}")
+                correlations[mapping['label']] = abs(corr)
+
+        if julia:
+            print(f"\n--- Filled Julia Set Correlation Results ({JULIA_RESOLUTION}x{JULIA_RESOLUTION} grids) ---")
+            with instrumentation.stage('julia'):
+                for name, mapping in mappings.items():
+                    metrics = julia_metrics(df_clean[f'z_{name}'].to_numpy(), resolution=JULIA_RESOLUTION,
+                                            max_iter=JULIA_MAX_ITER, workers=julia_workers)
+                    # Masked parameters (nan z) have no Julia set: count them as empty
+                    interior = np.nan_to_num(metrics['interior_fraction'], nan=0.0)
+                    corr, _ = pearsonr(collatz_rates, interior)
+                    print(f"{('Julia ' + mapping['label'] + ':').ljust(34)} r = {corr:.4f} "
+                          f"({int(metrics['connected'].sum())}/{len(interior)} connected)")
+                    labels[f'julia_{name}'] = 'Julia ' + mapping['label']
+                    series[f'julia_{name}'] = interior
+                    instrumentation.count(f'julia_sets_{name}', len(interior))
+
+        if n_resamples > 0:
+            with instrumentation.stage('significance'):
+                significance = correlation_significance(
+                    collatz_rates, series, n_permutations=n_resamples, n_bootstrap=n_resamples,
+                    seed=significance_seed, workers=significance_workers)
+            print(f"\n--- Significance ({n_resamples} permutations / bootstrap resamples) ---")
+            for name, label in labels.items():
+                stats = significance[name]
+                ci_low, ci_high = stats['pearson_ci']
+                # Resamples without spread have no r and are not in the interval
+                ci_note = (f" of {stats['pearson_ci_resamples']} resamples"
+                           if stats['pearson_ci_resamples'] < n_resamples else '')
+                print(f"{(label + ':').ljust(34)} "
+                      f"p = {stats['pearson_p_permutation']:.4g}, 95% CI [{ci_low:.4f}, {ci_high:.4f}]{ci_note}, "
+                      f"rho = {stats['spearman_rho']:.4f} (p = {stats['spearman_p_permutation']:.4g}), "
+                      f"tau = {stats['kendall_tau']:.4f} (p = {stats['kendall_p']:.4g})")
+            instrumentation.metadata['significance'] = significance
+
+        best_hypothesis = max(correlations, key=correlations.get)
+        best_r = correlations[best_hypothesis]
+
+        print("\n-------------------------------------")
+        print(f"🏆 Best Correlation Found: {best_hypothesis} (r = {best_r:.4f})")
+        print("-------------------------------------") 
+        print(f"✅ Updated data saved successfully to {store.path} with new columns (z_polar, escape_polar, etc.).")
+        if export_csv:
+            with instrumentation.stage('export_csv'):
+                store.export_csv(data_path)
+            print(f"✅ CSV export written to {data_path}")
+
+    report_path = instrumentation.write_report(run_report_path(data_path, 'experiment_02'))
+    print(f"✅ Run report saved to {report_path}")
 
 
 
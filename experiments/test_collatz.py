@@ -6,7 +6,15 @@ from typing import List, Dict
 # Add parent directory (src/) to the path to import collatz_generators
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.collatz_generators import generalized_collatz
+from src.collatz_generators import generalized_collatz, generalized_collatz_summary, iter_generalized_collatz
+from src.collatz_metrics import measure_collatz_behavior, collatz_distribution
+from src.collatz_cache import CollatzOutcomeCache
+from src.collatz_batch import batch_generalized_collatz, STATUS_NAMES
+from src.collatz_sieve import sieve_outcomes
+from src.backends import BACKENDS, get_backend
+from src.collatz_preclassifier import preclassify_parameter_set
+from src.correlation_stats import correlation_significance
+from src.julia_sets import julia_metrics, julia_grid_axis
 
 def run_all_tests():
     """Runs a few critical tests for the generalized_collatz function."""
@@ -45,5 +53,216 @@ def run_all_tests():
 
     print("-" * 35)
 
+    # Test Case 3: The vectorized, constant-memory, jump and sieve engines must reproduce the
+    # per-n metrics exactly (converging, cycling, diverging and invalid parameter sets).
+    param_sets = [(2, 3, 1), (2, -1, 3), (3, 4, 1), (9, 1, 2), (5, 6, 5), (1, 2, 3)]
+    mismatches = []
+    for a4, b4, c4 in param_sets:
+        expected_4 = measure_collatz_behavior(a4, b4, c4, test_range=(0, 60), max_iterations=5000)
+        for engine in ('numpy', 'summary', 'jump', 'sieve'):
+            result_4 = measure_collatz_behavior(a4, b4, c4, test_range=(0, 60), max_iterations=5000, engine=engine)
+            if result_4 != expected_4:
+                mismatches.append(((a4, b4, c4, engine), expected_4, result_4))
+    # Per start, runaway starts are settled exactly: (2, 2, 1) diverges, (3, 1, 3) only climbs by 3
+    for params, max_iterations_4 in (((2, 2, 1), 2000), ((2, 2, 1), 150), ((3, 1, 3), 2000)):
+        sieve_4 = sieve_outcomes(*params, end=60, max_iterations=max_iterations_4, max_classes=64)
+        for n4 in range(1, 60):
+            summary_4 = generalized_collatz_summary(n4, *params, max_iterations_4)
+            expected_4 = (summary_4['status'], summary_4['length'])
+            result_4 = (STATUS_NAMES[sieve_4['status'][n4 - 1]], int(sieve_4['length'][n4 - 1]))
+            if result_4 != expected_4:
+                mismatches.append((params + (n4, max_iterations_4, 'sieve_outcomes'), expected_4, result_4))
+
+    if not mismatches:
+        print(f"✅ Test 3 (Vectorized, summary, jump and sieve engines match per-n engine): Passed")
+    else:
+        print(f"❌ Test 3 Failed!")
+        for params, expected_4, result_4 in mismatches:
+            print(f"   {params} Expected: {expected_4}")
+            print(f"   {params} Received: {result_4}")
+
+    print("-" * 35)
+
+    # Test Case 4: The outcome cache (with a tiny LRU to force evictions) must not change the metrics
+    mismatches = []
+    for a5, b5, c5 in param_sets:
+        expected_5 = measure_collatz_behavior(a5, b5, c5, test_range=(0, 60), max_iterations=5000)
+        cache_5 = CollatzOutcomeCache(a5, b5, c5, max_entries=8)
+        result_5 = measure_collatz_behavior(a5, b5, c5, test_range=(0, 60), max_iterations=5000, cache=cache_5)
+        if result_5 != expected_5:
+            mismatches.append(((a5, b5, c5), expected_5, result_5))
+
+    if not mismatches:
+        print(f"✅ Test 4 (Outcome cache matches uncached run): Passed")
+    else:
+        print(f"❌ Test 4 Failed!")
+        for params, expected_5, result_5 in mismatches:
+            print(f"   {params} Expected: {expected_5}")
+            print(f"   {params} Received: {result_5}")
+
+    print("-" * 35)
+
+    # Test Case 5: The lazy generator yields the same sequence and reports the status on return
+    trajectory = iter_generalized_collatz(n1, a1, b1, c1)
+    streamed_seq = []
+    while True:
+        try:
+            streamed_seq.append(next(trajectory))
+        except StopIteration as stop:
+            streamed_status = stop.value['status']
+            break
+
+    if streamed_seq == expected_seq_1 and streamed_status == expected_status_1:
+        print(f"✅ Test 5 (Lazy generator @ 6): Passed")
+    else:
+        print(f"❌ Test 5 Failed!")
+        print(f"   Expected: {expected_seq_1} | Status: {expected_status_1}")
+        print(f"   Received: {streamed_seq} | Status: {streamed_status}")
+
+    print("-" * 35)
+
+    # Test Case 6: Every compute backend agrees with the reference backend
+    reference = get_backend('reference')
+    expected_6 = reference.collatz_metrics_many(param_sets, test_range=(0, 60), max_iterations=5000)
+    points_6 = [-1.5 + 0.2j, 0.3 + 0.5j, -0.75 + 0.1j, 0.0, 1.0 + 1.0j]
+    expected_escape_6 = reference.escape_time(points_6, max_iter=100, convention='update_first').tolist()
+    failures = []
+    for backend_name in BACKENDS:
+        backend = get_backend(backend_name)
+        result_6 = backend.collatz_metrics_many(param_sets, test_range=(0, 60), max_iterations=5000)
+        escape_6 = backend.escape_time(points_6, max_iter=100, convention='update_first').tolist()
+        if result_6 != expected_6 or escape_6 != expected_escape_6:
+            failures.append(backend_name)
+
+    if not failures:
+        print(f"✅ Test 6 (Compute backends match reference backend): Passed")
+    else:
+        print(f"❌ Test 6 Failed!")
+        print(f"   Mismatching backends: {failures}")
+
+    print("-" * 35)
+
+    # Test Case 7: Parameter sets decided (fully or partly) by the pre-classifier
+    # give the same metrics as simulating every starting value
+    # (2, 2, 4) runs away mod 2^k only (odd n -> n + 2); (6, 1, 8) after a prefix (2 -> 10 -> 3)
+    expected_reasons_7 = {(4, 2, 1): 'runaway_residues', (3, 2, 1): 'partial_runaway',
+                          (2, 2, 4): 'runaway_residues', (6, 1, 8): 'runaway_residues',
+                          (2, 3, 1): 'undecided', (0, 2, 1): 'invalid_divisor'}
+    mismatches_7 = []
+    for params, expected_reason in expected_reasons_7.items():
+        reason_7 = preclassify_parameter_set(*params, test_range=(1, 50))['reason']
+        if reason_7 != expected_reason:
+            mismatches_7.append((params, expected_reason, reason_7))
+        for engine in ('python', 'summary', 'numpy'):
+            expected_7 = measure_collatz_behavior(*params, test_range=(0, 60), max_iterations=5000,
+                                                  engine=engine, preclassify=False)
+            result_7 = measure_collatz_behavior(*params, test_range=(0, 60), max_iterations=5000, engine=engine)
+            if result_7 != expected_7:
+                mismatches_7.append((params + (engine,), expected_7, result_7))
+
+    if not mismatches_7:
+        print(f"✅ Test 7 (Pre-classified parameter sets match full simulation): Passed")
+    else:
+        print(f"❌ Test 7 Failed!")
+        for params, expected_7, result_7 in mismatches_7:
+            print(f"   {params} Expected: {expected_7}")
+            print(f"   {params} Received: {result_7}")
+
+    print("-" * 35)
+
+    # Test Case 8: The shared-memory parallel mode gives the same metrics, and its
+    # per-n arrays match the batched engine
+    mismatches_8 = []
+    for params in param_sets:
+        expected_8 = measure_collatz_behavior(*params, test_range=(0, 60), max_iterations=5000)
+        distribution_8 = collatz_distribution(*params, test_range=(0, 60), max_iterations=5000,
+                                              workers=2, chunk_size=16)
+        batch_8 = batch_generalized_collatz(range(0, 60), *params, max_iterations=5000)
+        if (distribution_8['metrics'] != expected_8
+                or distribution_8['status'].tolist() != batch_8['status'].tolist()
+                or distribution_8['length'].tolist() != batch_8['length'].tolist()):
+            mismatches_8.append(params)
+
+    if not mismatches_8:
+        print(f"✅ Test 8 (Shared-memory parallel distribution matches serial engines): Passed")
+    else:
+        print(f"❌ Test 8 Failed!")
+        print(f"   Mismatching parameter sets: {mismatches_8}")
+
+    print("-" * 35)
+
+    # Test Case 9: Batched correlation significance agrees with scipy and does not
+    # depend on how the resamples are spread over processes
+    from scipy.stats import kendalltau, pearsonr, spearmanr
+    rates_9 = [measure_collatz_behavior(*params, test_range=(1, 30), max_iterations=500)['convergence_rate']
+               for params in param_sets + [(2, 5, 1), (3, 2, 1), (2, 1, 1), (2, 3, 5)]]
+    # 'spike' is constant except for its last value, so resamples that miss it have no r
+    series_9 = {'linear': [i * 0.5 for i in range(len(rates_9))], 'ties': [i % 3 for i in range(len(rates_9))],
+                'spike': [0] * (len(rates_9) - 1) + [1]}
+    serial_9 = correlation_significance(rates_9, series_9, n_permutations=500, n_bootstrap=500, chunk_elements=64)
+    parallel_9 = correlation_significance(rates_9, series_9, n_permutations=500, n_bootstrap=500,
+                                          chunk_elements=64, workers=2)
+    failures_9 = []
+    for name, values in series_9.items():
+        stats_9 = serial_9[name]
+        reference_9 = (pearsonr(rates_9, values)[0], spearmanr(rates_9, values)[0], kendalltau(rates_9, values)[0])
+        received_9 = (stats_9['pearson_r'], stats_9['spearman_rho'], stats_9['kendall_tau'])
+        if (any(abs(r - e) > 1e-9 for r, e in zip(received_9, reference_9))
+                or not 0 < stats_9['pearson_p_permutation'] <= 1
+                or not stats_9['pearson_ci'][0] <= stats_9['pearson_ci'][1]
+                or str(stats_9) != str(parallel_9[name])):
+            failures_9.append((name, reference_9, stats_9))
+    if not 0 < serial_9['spike']['pearson_ci_resamples'] < 500:
+        failures_9.append(('spike', 'some of 500 resamples dropped', serial_9['spike']['pearson_ci_resamples']))
+
+    if not failures_9:
+        print(f"✅ Test 9 (Batched correlation significance matches scipy): Passed")
+    else:
+        print(f"❌ Test 9 Failed!")
+        for name, expected_9, result_9 in failures_9:
+            print(f"   {name} Expected: {expected_9}")
+            print(f"   {name} Received: {result_9}")
+
+    print("-" * 35)
+
+    # Test Case 10: Batched filled-Julia-set metrics match a per-pixel loop, and
+    # chunking / worker processes do not change them
+    params_10 = [0j, -1 + 0j, 0.5 + 0j, -0.123 + 0.745j, -2 + 0j, 3 + 1j, complex(float('nan'), float('nan'))]
+    resolution_10, max_iter_10 = 17, 40
+    axis_10 = julia_grid_axis(resolution_10)
+    expected_10 = []
+    for c_10 in params_10:
+        if c_10 != c_10:
+            expected_10.append(None)
+            continue
+        radius_10 = max(2.0, abs(c_10))
+        counts_10 = []
+        for y_10 in axis_10:
+            for x_10 in axis_10:
+                z_10, count_10 = complex(x_10, y_10), max_iter_10
+                for i in range(max_iter_10):
+                    if abs(z_10) > radius_10:
+                        count_10 = i
+                        break
+                    z_10 = z_10 * z_10 + c_10
+                counts_10.append(count_10)
+        expected_10.append(sum(count == max_iter_10 for count in counts_10) / len(counts_10))
+
+    serial_10 = julia_metrics(params_10, resolution=resolution_10, max_iter=max_iter_10)
+    parallel_10 = julia_metrics(params_10, resolution=resolution_10, max_iter=max_iter_10, workers=2,
+                                chunk_elements=2 * resolution_10 ** 2)
+    received_10 = [None if fraction != fraction else fraction for fraction in serial_10['interior_fraction'].tolist()]
+    connected_10 = serial_10['connected'].tolist()
+    if (received_10 == expected_10
+            and connected_10 == [True, True, False, True, True, False, False]
+            and all(str(serial_10[name].tolist()) == str(parallel_10[name].tolist()) for name in serial_10)):
+        print(f"✅ Test 10 (Batched filled-Julia-set metrics match per-pixel loop): Passed")
+    else:
+        print(f"❌ Test 10 Failed!")
+        print(f"   Expected interior fractions: {expected_10}")
+        print(f"   Received interior fractions: {received_10}, connected: {connected_10}")
+
+    print("-" * 35)
+
 if __name__ == "__main__":
-    run_all_tests()
\ No newline at end of file
+    run_all_tests()
@@ -2,32 +2,32 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import os
+import sys
 
-def plot_collatz_mandelbrot_overlay(csv_path: str):
+# Project root goes first: experiments/src would otherwise shadow the top-level src package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.background_tiles import get_background
+from src.results_store import load_results
+
+def plot_collatz_mandelbrot_overlay(csv_path: str, resolution=(400, 400), max_iter: int = 50, workers=None):
     """
     Plots experimental (a,b,c) points over the Mandelbrot set.
     Color of points = Collatz Convergence Rate.
+    resolution / max_iter set the background; new backgrounds are rendered in
+    tiles across workers processes (None = every core) and cached on disk.
     """
     if not os.path.exists(csv_path):
         print(f"Error: CSV file not found at {csv_path}. Run the experiment first!")
         return
         
-    # 1. Generate Mandelbrot Background (Low-res for speed)
-    h, w = 400, 400
-    y, x = np.ogrid[-1.5:1.5:h*1j, -2.5:1.5:w*1j]
-    c = x + y*1j
-    z = c
-    div_time = h + np.zeros(z.shape, dtype=int)
-
-    for i in range(50): # Reduced iterations for quick background plot
-        z = z**2 + c
-        diverge = z * np.conj(z) > 2**2            
-        div_now = diverge & (div_time == h)  
-        div_time[div_now] = i                  
-        z[diverge] = 2                        
+    # 1. Load Mandelbrot Background (default: low-res, reduced iterations; cached under data/cache/backgrounds)
+    h, w = resolution
+    div_time = get_background(extent=(-2.5, 1.5, -1.5, 1.5), resolution=(h, w), max_iter=max_iter,
+                              bailout=2.0, interior_value=h, workers=workers,
+                              method='mariani_silver')
 
-    # 2. Load Experiment Data
-    df = pd.read_csv(csv_path)
+    # 2. Load Experiment Data (columnar store when present, else the CSV)
+    df = load_results(csv_path, columns=['complex_real', 'complex_imag', 'collatz_conv_rate'])
     
     # 3. Plotting
     plt.figure(figsize=(12, 10))
@@ -2,6 +2,12 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import os
+import sys
+
+# Project root goes first: experiments/src would otherwise shadow the top-level src package
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from src.results_store import load_results
+
 def plot_correlation_scatter(df: pd.DataFrame, output_path: str):
     """
     Creates a simple scatter plot to visualize the R=0.6567 correlation.
@@ -42,8 +48,8 @@ if __name__ == "__main__":
     csv_file_path = os.path.join(script_dir, '..', 'data', 'results', 'experiment_01_results.csv')
     output_path = os.path.join(script_dir, '..', 'data', 'results', 'correlation_scatter_C.png')
    
-    # Load the data first
-    df = pd.read_csv(csv_file_path)
+    # Load the data first (only the two columns the scatter plot needs)
+    df = load_results(csv_file_path, columns=['collatz_conv_rate', 'escape_polar'])
 
 
     # --- FINAL VISUALIZATION STEP ---
@@ -1,52 +1,153 @@
+import argparse
+import io
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List
+
+import numpy as np
 import pandas as pd
-import os
 
-def parse_raw_log(input_file, output_file):
-    
-    # Simplified Regex: ONLY captures parameters (a, b, c) and the Conv Rate
-    # Note: This is designed to match the log format you provided.
-    pattern = re.compile(
-        # Group 1 (a), Group 2 (b), Group 3 (c)
-        r"Sample \d+/\d+: \(a,b,c\)=\((\d+),(\d+),(\d+)\) \| Conv Rate: (\d+\.\d+) \|"
-    )
-    
-    data = []
-    
-    try:
-        with open(input_file, 'r') as f:
-            for line in f:
-                match = pattern.search(line)
-                if match:
-                    # Extracted values from the groups in the regex
-                    a, b, c, conv_rate = match.groups()
-                    
-                    data.append({
-                        'a_divisor': int(a),
-                        'b_multiplier': int(b),
-                        'c_adder': int(c),
-                        'collatz_conv_rate': float(conv_rate)
-                    })
-        
-        if not data:
-            print("ERROR: No data matched the expected log pattern. Please check the content of the raw log file.")
-            return
-
-        df = pd.DataFrame(data)
-        
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        df.to_csv(output_file, index=False)
-        
-        print(f"✅ Success! Recovered and saved {len(df)} samples to {output_file}")
-        
-    except FileNotFoundError:
-        print(f"ERROR: Input log file not found at {input_file}.")
+from src.results_store import ResultsStore, results_store_path
+
+# Captures a, b, c, the Conv Rate and the Complex coordinates (V1 mapping) of
+# one "Sample i/N: ..." line as printed by experiment_01. The coordinates are
+# logged with two decimals, so they are recovered rounded. Matched on raw
+# bytes so chunks never need decoding.
+_NUMBER = rb"(-?(?:\d+\.\d+|nan|inf))"
+pattern = re.compile(
+    rb"Sample \d+/\d+: \(a,b,c\)=\((\d+),(\d+),(\d+)\) \| Conv Rate: (\d+\.\d+) \|"
+    rb"(?: Complex: " + _NUMBER + rb" \+ " + _NUMBER + rb"i)?"
+)
+
+COLUMNS = ('a_divisor', 'b_multiplier', 'c_adder', 'collatz_conv_rate', 'complex_real', 'complex_imag')
+_COLUMN_DTYPES = {'a_divisor': np.int64, 'b_multiplier': np.int64, 'c_adder': np.int64,
+                  'collatz_conv_rate': np.float64, 'complex_real': np.float64, 'complex_imag': np.float64}
+
+# Default size of the byte range one worker parses at a time
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def _byte_ranges(path: str, chunk_bytes: int) -> List[tuple]:
+    """Splits a file into (path, start, end) ranges; a line belongs to the range it starts in."""
+    size = os.path.getsize(path)
+    return [(path, start, min(start + chunk_bytes, size)) for start in range(0, size, chunk_bytes)]
+
+
+def _parse_range(work_unit) -> Dict[str, np.ndarray]:
+    """Worker entry point: parses the lines starting in [start, end) of one file into columns."""
+    path, start, end = work_unit
+    with open(path, 'rb') as f:
+        if start > 0:
+            # Skip the tail of the line that started in the previous range
+            f.seek(start - 1)
+            f.readline()
+        block = f.read(max(end - f.tell(), 0))
+        if block and not block.endswith(b'\n'):
+            # Finish the last line, which may run past end
+            block += f.readline()
+    rows = pattern.findall(block)
+    if not rows:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in _COLUMN_DTYPES.items()}
+
+    # Matched fields become CSV text for pandas' C parser, far faster than
+    # converting the strings one by one; coordinates missing from a line are empty -> NaN
+    text = b'\n'.join(b','.join(row) for row in rows)
+    df = pd.read_csv(io.BytesIO(text), header=None, names=list(COLUMNS), dtype=_COLUMN_DTYPES)
+    return {name: df[name].to_numpy() for name in COLUMNS}
+
+
+def _parse_in_order(work_units: List[tuple], workers: int) -> Iterable[Dict[str, np.ndarray]]:
+    """
+    Yields the parsed chunks in file order. At most 2 * workers chunks are in
+    flight (submitted or waiting to be consumed), so memory stays bounded
+    however large the logs are.
+    """
+    if workers <= 1 or len(work_units) <= 1:
+        yield from map(_parse_range, work_units)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for unit in work_units:
+            pending.append(executor.submit(_parse_range, unit))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def parse_raw_log(input_files, output_file, workers=None, chunk_bytes=DEFAULT_CHUNK_BYTES,
+                  batch_rows=1000000, export_csv=True):
+    """
+    Recovers Experiment 01 results from one or more console logs.
+
+    Each log is split into chunk_bytes byte ranges that a process pool parses
+    (workers=None uses every core). Parsed rows go into the columnar results
+    store of output_file (replacing its contents) in batches of about
+    batch_rows rows, so memory use does not grow with the size of the logs.
+    export_csv also writes output_file as CSV from the store at the end.
+    Returns the number of recovered samples.
+    """
+    if isinstance(input_files, str):
+        input_files = [input_files]
+    missing = [path for path in input_files if not os.path.exists(path)]
+    if missing:
+        print(f"ERROR: Input log file not found at {', '.join(missing)}.")
+        return 0
+
+    work_units = [unit for path in input_files for unit in _byte_ranges(path, chunk_bytes)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    store = ResultsStore(results_store_path(output_file))
+    total = 0
+    batch = []
+    batch_size = 0
+
+    def flush():
+        nonlocal total
+        df = pd.DataFrame({name: np.concatenate([chunk[name] for chunk in batch]) for name in COLUMNS})
+        if total == 0:
+            store.overwrite(df)
+        else:
+            store.append(df)
+        total += len(df)
+        batch.clear()
+
+    for chunk in _parse_in_order(work_units, workers):
+        if len(chunk['a_divisor']) == 0:
+            continue
+        batch.append(chunk)
+        batch_size += len(chunk['a_divisor'])
+        if batch_size >= batch_rows:
+            flush()
+            batch_size = 0
+    if batch:
+        flush()
+
+    if total == 0:
+        print("ERROR: No data matched the expected log pattern. Please check the content of the raw log file.")
+        return 0
+
+    print(f"✅ Success! Recovered {total} samples into {store.path}")
+    if export_csv:
+        store.export_csv(output_file)
+        print(f"✅ CSV export written to {output_file}")
+    return total
+
 
 if __name__ == "__main__":
-    # Defines the output path: ../data/results/experiment_01_results.csv
-    output_path = os.path.join('..', 'data', 'results', 'experiment_01_results.csv')
+    parser = argparse.ArgumentParser(description="Recover Experiment 01 results from console logs.")
     # Assumes the raw log is in the root directory
-    parse_raw_log('raw_experiment_01_log.txt', output_path)
-
+    parser.add_argument('logs', nargs='*', default=['raw_experiment_01_log.txt'])
+    # Defines the output path: ../data/results/experiment_01_results.csv
+    parser.add_argument('--output', default=os.path.join('..', 'data', 'results', 'experiment_01_results.csv'))
+    parser.add_argument('--workers', type=int, default=None, help="parser processes (default: every core)")
+    parser.add_argument('--chunk-mb', type=int, default=DEFAULT_CHUNK_BYTES // (1024 * 1024))
+    parser.add_argument('--no-csv', action='store_true', help="only write the columnar store")
+    args = parser.parse_args()
 
+    parse_raw_log(args.logs, args.output, workers=args.workers, chunk_bytes=args.chunk_mb * 1024 * 1024,
+                  export_csv=not args.no_csv)
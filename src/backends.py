@@ -0,0 +1,195 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .collatz_batch import batch_generalized_collatz, _step_array, STATUS_CODES
+from .collatz_generators import collatz_step, generalized_collatz
+from .collatz_metrics import measure_collatz_behavior
+from .mandelbrot_utils import escape_time_array, mandelbrot_escape_time
+from .mapping_functions import get_mapping
+
+# Backend used when none is named explicitly; overridden by this environment variable
+BACKEND_ENV_VAR = 'COLLATZ_MANDELBROT_BACKEND'
+DEFAULT_BACKEND = 'numpy'
+
+# Below this many starts per parameter set the per-n engine beats the lockstep
+# one (measured on sampled sweep parameters at max_iterations 1e5: ~5x faster
+# at 49 starts, even at ~100-200), so NumpyBackend keeps 'python' there
+NUMPY_ENGINE_MIN_STARTS = 200
+
+
+class ReferenceBackend:
+    """
+    Pure-Python kernels, one value at a time. Slow, but every result comes
+    straight from generalized_collatz / mandelbrot_escape_time, so this is the
+    backend the faster ones are checked against.
+    """
+    name = 'reference'
+    # measure_collatz_behavior engine used for per-parameter-set metrics (see collatz_engine_for)
+    collatz_engine = 'python'
+
+    def collatz_step(self, n, a: int, b: int, c: int):
+        """One map step for a scalar or an array of values."""
+        if np.ndim(n) == 0:
+            return collatz_step(n, a, b, c)
+        return np.array([collatz_step(int(v), a, b, c) for v in np.ravel(n)], dtype=object).reshape(np.shape(n))
+
+    def collatz_run(self, n: int, a: int, b: int, c: int, max_iterations: int = 1000000) -> Dict:
+        """Final status and sequence length for one starting value."""
+        res = generalized_collatz(n, a, b, c, max_iterations)
+        return {'status': res['status'], 'length': len(res['sequence'])}
+
+    def collatz_batch(self, starts, a: int, b: int, c: int, max_iterations: int = 1000000) -> Dict:
+        """Per-start status codes (collatz_batch.STATUS_NAMES) and lengths, like batch_generalized_collatz."""
+        runs = [self.collatz_run(int(n), a, b, c, max_iterations) for n in np.ravel(starts)]
+        return {
+            'status': np.array([STATUS_CODES[r['status']] for r in runs], dtype=np.int8),
+            'length': np.array([r['length'] for r in runs], dtype=np.int64),
+        }
+
+    def collatz_metrics(self, a: int, b: int, c: int, test_range=(1, 50), max_iterations: int = 1000000) -> Dict:
+        """measure_collatz_behavior for one parameter set."""
+        return measure_collatz_behavior(a, b, c, test_range, max_iterations,
+                                        engine=self.collatz_engine_for(test_range))
+
+    def collatz_engine_for(self, test_range) -> str:
+        """measure_collatz_behavior engine for per-parameter-set metrics over test_range."""
+        return self.collatz_engine
+
+    def collatz_metrics_many(self, params, test_range=(1, 50), max_iterations: int = 1000000) -> List[Dict]:
+        """measure_collatz_behavior for every (a, b, c) in params, in order."""
+        return [self.collatz_metrics(a, b, c, test_range, max_iterations) for a, b, c in params]
+
+    def escape_time(self, points, max_iter: int = 1000, bailout: float = 2.0,
+                    convention: str = 'check_first') -> np.ndarray:
+        """Escape time of every point (any shape), iterating each point in plain Python."""
+        points = np.asarray(points, dtype=np.complex128)
+        counts = [mandelbrot_escape_time(complex(p), max_iter, interior_check=False,
+                                         bailout=bailout, convention=convention)
+                  for p in points.ravel()]
+        return np.array(counts, dtype=np.int64).reshape(points.shape)
+
+    def map_params(self, name: str, a, b, c) -> np.ndarray:
+        """Registered mapping `name` applied element by element."""
+        func = get_mapping(name)
+        a, b, c = np.broadcast_arrays(np.asarray(a), np.asarray(b), np.asarray(c))
+        z = [func(float(x), float(y), float(w)) for x, y, w in zip(a.ravel(), b.ravel(), c.ravel())]
+        return np.array(z, dtype=np.complex128).reshape(a.shape)
+
+
+class NumpyBackend(ReferenceBackend):
+    """Vectorized kernels: lockstep Collatz lanes, masked escape time, array mappings."""
+    name = 'numpy'
+    collatz_engine = 'numpy'
+
+    def collatz_engine_for(self, test_range) -> str:
+        if test_range[1] - test_range[0] < NUMPY_ENGINE_MIN_STARTS:
+            return 'python'
+        return self.collatz_engine
+
+    def collatz_step(self, n, a: int, b: int, c: int):
+        if np.ndim(n) == 0:
+            return collatz_step(n, a, b, c)
+        # Reuse the batch engine's int64 step; values that would overflow fall back to Python ints
+        values = np.asarray(n, dtype=np.int64)
+        next_values, overflow = _step_array(values.ravel(), a, b, c)
+        if overflow.any():
+            next_values = next_values.astype(object)
+            for i in np.flatnonzero(overflow):
+                next_values[i] = collatz_step(int(values.ravel()[i]), a, b, c)
+        return next_values.reshape(values.shape)
+
+    def collatz_batch(self, starts, a: int, b: int, c: int, max_iterations: int = 1000000) -> Dict:
+        return batch_generalized_collatz(starts, a, b, c, max_iterations)
+
+    def escape_time(self, points, max_iter: int = 1000, bailout: float = 2.0,
+                    convention: str = 'check_first') -> np.ndarray:
+        return escape_time_array(points, max_iter, bailout, convention)
+
+    def map_params(self, name: str, a, b, c) -> np.ndarray:
+        return np.asarray(get_mapping(name)(np.asarray(a), np.asarray(b), np.asarray(c)), dtype=np.complex128)
+
+
+def _metrics_chunk(work_unit) -> List[Dict]:
+    params, test_range, max_iterations = work_unit
+    return NumpyBackend().collatz_metrics_many(params, test_range, max_iterations)
+
+
+def _escape_chunk(work_unit) -> np.ndarray:
+    points, max_iter, bailout, convention = work_unit
+    return escape_time_array(points, max_iter, bailout, convention)
+
+
+def _batch_chunk(work_unit) -> Dict:
+    starts, a, b, c, max_iterations = work_unit
+    return batch_generalized_collatz(starts, a, b, c, max_iterations)
+
+
+class MultiprocessingBackend(NumpyBackend):
+    """
+    NumPy kernels spread over a process pool: parameter sets, starting values
+    and escape-time points are split into chunks and evaluated by workers.
+    """
+    name = 'multiprocessing'
+
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 65536, params_per_chunk: int = 16):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.params_per_chunk = params_per_chunk
+
+    def _map(self, func, work_units):
+        if self.workers <= 1 or len(work_units) <= 1:
+            return list(map(func, work_units))
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(func, work_units))
+
+    def collatz_batch(self, starts, a: int, b: int, c: int, max_iterations: int = 1000000) -> Dict:
+        starts = np.asarray(starts, dtype=np.int64).ravel()
+        chunks = [starts[i:i + self.chunk_size] for i in range(0, starts.size, self.chunk_size)]
+        results = self._map(_batch_chunk, [(chunk, a, b, c, max_iterations) for chunk in chunks])
+        if not results:
+            return super().collatz_batch(starts, a, b, c, max_iterations)
+        return {
+            'status': np.concatenate([r['status'] for r in results]),
+            'length': np.concatenate([r['length'] for r in results]),
+        }
+
+    def collatz_metrics_many(self, params, test_range=(1, 50), max_iterations: int = 1000000) -> List[Dict]:
+        params = [tuple(int(v) for v in p) for p in params]
+        step = self.params_per_chunk
+        chunks = [params[i:i + step] for i in range(0, len(params), step)]
+        results = self._map(_metrics_chunk, [(chunk, test_range, max_iterations) for chunk in chunks])
+        return [row for chunk_rows in results for row in chunk_rows]
+
+    def escape_time(self, points, max_iter: int = 1000, bailout: float = 2.0,
+                    convention: str = 'check_first') -> np.ndarray:
+        points = np.asarray(points, dtype=np.complex128)
+        flat = points.ravel()
+        chunks = [flat[i:i + self.chunk_size] for i in range(0, flat.size, self.chunk_size)]
+        results = self._map(_escape_chunk, [(chunk, max_iter, bailout, convention) for chunk in chunks])
+        if not results:
+            return np.zeros(points.shape, dtype=np.int64)
+        return np.concatenate(results).reshape(points.shape)
+
+
+BACKENDS = {
+    'reference': ReferenceBackend,
+    'numpy': NumpyBackend,
+    'multiprocessing': MultiprocessingBackend,
+}
+
+
+def get_backend(name: Optional[str] = None):
+    """
+    Backend instance by name. Without a name, uses the COLLATZ_MANDELBROT_BACKEND
+    environment variable, falling back to DEFAULT_BACKEND. Backend instances
+    are also accepted and returned unchanged.
+    """
+    if name is not None and not isinstance(name, str):
+        return name
+    name = name or os.environ.get(BACKEND_ENV_VAR) or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}'. Use one of {sorted(BACKENDS)}.")
+    return BACKENDS[name]()
@@ -0,0 +1,104 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+from .mandelbrot_utils import mandelbrot_background_grid
+
+DEFAULT_TILE_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', 'data', 'cache', 'backgrounds'))
+
+# Extent and resolution of the original overlay backgrounds
+DEFAULT_EXTENT = (-2.5, 1.5, -1.5, 1.5)
+DEFAULT_RESOLUTION = (400, 400)
+
+
+def background_tile_path(extent=DEFAULT_EXTENT, resolution=DEFAULT_RESOLUTION, max_iter: int = 50,
+                         bailout: float = 2.0, interior_value: Optional[int] = None,
+                         tile_dir: str = DEFAULT_TILE_DIR) -> str:
+    """File the background for these settings is (or will be) cached in."""
+    extent_key = '_'.join(repr(float(v)) for v in extent)
+    interior_key = 'max' if interior_value is None else str(int(interior_value))
+    name = (f"mandelbrot_{extent_key}_{resolution[0]}x{resolution[1]}"
+            f"_it{max_iter}_b{float(bailout)!r}_in{interior_key}.npy")
+    return os.path.join(tile_dir, name)
+
+
+def get_background(extent=DEFAULT_EXTENT, resolution=DEFAULT_RESOLUTION, max_iter: int = 50,
+                   bailout: float = 2.0, interior_value: Optional[int] = None,
+                   tile_dir: str = DEFAULT_TILE_DIR, tile_size: int = 1024,
+                   workers: Optional[int] = 1, method: str = 'brute_force') -> np.ndarray:
+    """
+    Mandelbrot background grid for an overlay plot, computed once per
+    (extent, resolution, max_iter, bailout, interior_value) and cached as a
+    .npy file under data/cache/backgrounds.
+
+    Returns a read-only memory map of the cached file, so later plots load it
+    without reading or copying the whole grid. See mandelbrot_background_grid
+    for the grid layout. A missing background is rendered with
+    render_background (tile_size, workers, method), so large ones never sit in
+    RAM whole. method is not part of the cache key: both methods give the same grid.
+    """
+    path = background_tile_path(extent, resolution, max_iter, bailout, interior_value, tile_dir)
+    if not os.path.exists(path):
+        render_background(path, extent, resolution, max_iter, bailout, interior_value, tile_size, workers, method)
+    return np.load(path, mmap_mode='r')
+
+
+def render_background(path: str, extent=DEFAULT_EXTENT, resolution=DEFAULT_RESOLUTION, max_iter: int = 50,
+                      bailout: float = 2.0, interior_value: Optional[int] = None,
+                      tile_size: int = 1024, workers: Optional[int] = None, method: str = 'brute_force'):
+    """
+    Renders a background grid into a memory-mapped int32 .npy file at path.
+
+    The plane is split into tile_size x tile_size tiles that a process pool
+    computes independently (workers=None uses every core, 1 stays in this
+    process). Each worker writes its tile straight into the memory map, so
+    RAM use is bounded by the tiles in flight, not the image size. The file is
+    written under a temporary name and renamed into place when complete.
+    method='mariani_silver' renders each tile by boundary subdivision
+    (see mariani_silver_fill) instead of iterating every pixel.
+    """
+    h, w = resolution
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npy.tmp')
+    os.close(fd)
+
+    try:
+        out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.int32, shape=(h, w))
+        out.flush()
+        del out
+
+        work_units = [
+            (tmp_path, extent, resolution, max_iter, bailout, interior_value,
+             (r, min(r + tile_size, h)), (c, min(c + tile_size, w)), method)
+            for r in range(0, h, tile_size)
+            for c in range(0, w, tile_size)
+        ]
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1 or len(work_units) <= 1:
+            for unit in work_units:
+                _render_tile(unit)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(_render_tile, work_units))
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _render_tile(work_unit):
+    """Worker entry point: computes one tile and writes it into the shared memory map."""
+    path, extent, resolution, max_iter, bailout, interior_value, rows, cols, method = work_unit
+    tile = mandelbrot_background_grid(extent, resolution, max_iter, bailout, interior_value, rows, cols, method)
+    out = np.load(path, mmap_mode='r+')
+    out[rows[0]:rows[1], cols[0]:cols[1]] = tile
+    out.flush()
@@ -0,0 +1,243 @@
+import numpy as np
+from typing import Dict, Tuple
+
+from .collatz_generators import _probe_divergence, collatz_step, generalized_collatz_summary
+
+# Status codes used by the batched engine. The names match the strings
+# returned by generalized_collatz so the two paths can be compared directly.
+STATUS_NAMES = ('converged', 'cycled', 'diverged', 'max_iter', 'invalid_input')
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+CONVERGED = STATUS_CODES['converged']
+CYCLED = STATUS_CODES['cycled']
+MAX_ITER = STATUS_CODES['max_iter']
+INVALID_INPUT = STATUS_CODES['invalid_input']
+
+_INT64_MAX = np.iinfo(np.int64).max
+
+# Once this few lanes are still searching for a cycle, a lockstep NumPy step
+# costs more than stepping them one by one, so they finish in Python ints
+SCALAR_LANES = 64
+
+
+def _step_array(x: np.ndarray, a: int, b: int, c: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One lockstep step of generalized_collatz applied to every lane of x.
+    Returns (next_values, overflow). Lanes flagged in overflow would leave
+    int64 on b*x + c, so their next value is meaningless and must be
+    recomputed on the exact Python-int path.
+    """
+    # Powers of two use masks and shifts (same results, far cheaper than % and //)
+    a = int(a)
+    power_of_two = a & (a - 1) == 0
+    if power_of_two:
+        mask, shift = a - 1, a.bit_length() - 1
+        divisible = x & mask == 0
+    else:
+        divisible = x % a == 0
+    overflow = ~divisible & (np.abs(x) > _overflow_limit(b, c))
+
+    safe_x = np.where(divisible | overflow, 0, x)
+    numerator = b * safe_x + c
+
+    # Same special case as the scalar solver: (2, 3, 1) skips the division loop
+    if not (a == 2 and b == 3 and c == 1):
+        if power_of_two:
+            idx = np.flatnonzero(~divisible & ~overflow & (numerator & mask == 0) & (numerator > 0))
+            while idx.size:
+                numerator[idx] >>= shift
+                idx = idx[(numerator[idx] & mask == 0) & (numerator[idx] > 0)]
+        else:
+            idx = np.flatnonzero(~divisible & ~overflow & (numerator % a == 0) & (numerator > 0))
+            while idx.size:
+                numerator[idx] //= a
+                idx = idx[(numerator[idx] % a == 0) & (numerator[idx] > 0)]
+
+    return np.where(divisible, x >> shift if power_of_two else x // a, numerator), overflow
+
+
+def _overflow_limit(b: int, c: int) -> int:
+    """Largest |x| for which b*x + c stays inside int64."""
+    return (_INT64_MAX - abs(c)) // max(abs(b), 1)
+
+
+def _finish_brent(tortoise: int, hare: int, power: int, lam: int, hare_index: int, hare_limit: int,
+                  a: int, b: int, c: int):
+    """
+    Phase 1 of batch_generalized_collatz for one lane in Python ints, picking
+    up where the lockstep loop left it (after its meet / limit checks).
+    Returns ('met', lam), ('overflow', value, index) where the step from
+    value (at index) would leave int64, or None once hare_limit is passed.
+    """
+    limit = _overflow_limit(b, c)
+    while True:
+        if power == lam:
+            tortoise = hare
+            power *= 2
+            lam = 0
+        if hare % a != 0 and abs(hare) > limit:
+            return 'overflow', hare, hare_index
+        hare = collatz_step(hare, a, b, c)
+        lam += 1
+        hare_index += 1
+        if hare == tortoise:
+            return 'met', lam
+        if hare_index > hare_limit:
+            return None
+
+
+def _advance(x: np.ndarray, counts: np.ndarray, a: int, b: int, c: int) -> np.ndarray:
+    """Steps each lane of x forward by its own count (values already known to fit in int64)."""
+    x = x.copy()
+    idx = np.flatnonzero(counts > 0)
+    remaining = counts[idx].copy()
+    while idx.size:
+        x[idx], _ = _step_array(x[idx], a, b, c)
+        remaining -= 1
+        keep = remaining > 0
+        idx, remaining = idx[keep], remaining[keep]
+    return x
+
+
+def batch_generalized_collatz(starts, a: int, b: int, c: int, max_iterations: int = 1000000) -> Dict:
+    """
+    Lockstep NumPy version of generalized_collatz for many starting values at once.
+
+    Every start is a lane of an int64 array. Cycles are found with Brent's
+    algorithm so no per-lane visited set is needed; lanes that converge, cycle
+    or run out of iterations are masked out as they finish, and the last
+    SCALAR_LANES lanes finish the search one by one. Lanes that would
+    overflow int64 continue on exact Python ints from their last int64
+    value (_probe_divergence with its index as offset); only when that stays
+    undecided is the start re-run with generalized_collatz_summary.
+
+    Returns a dict with per-lane 'status' codes (see STATUS_NAMES),
+    'length', the len(sequence) that generalized_collatz would have returned,
+    and 'cycle_start', the index where the cycle begins (-1 unless converged/cycled).
+    """
+    starts = np.asarray(starts, dtype=np.int64).ravel()
+    count = starts.size
+    status = np.full(count, MAX_ITER, dtype=np.int8)
+    length = np.full(count, max_iterations + 1, dtype=np.int64)
+    cycle_start = np.full(count, -1, dtype=np.int64)
+
+    if a <= 0:
+        status[:] = INVALID_INPUT
+        length[:] = 0
+        return {'status': status, 'length': length, 'cycle_start': cycle_start}
+
+    invalid = starts <= 0
+    status[invalid] = INVALID_INPUT
+    length[invalid] = 0
+    if max_iterations <= 0:
+        return {'status': status, 'length': length, 'cycle_start': cycle_start}
+
+    fallback = np.zeros(count, dtype=bool)
+    # Last int64 value of each overflowed lane and its index in the trajectory
+    resume_value = np.zeros(count, dtype=np.int64)
+    resume_index = np.zeros(count, dtype=np.int64)
+
+    # --- Phase 1: Brent's cycle search, finds the cycle length (lam) ---
+    lanes = np.flatnonzero(~invalid)
+    previous = starts[lanes]
+    tortoise = previous
+    hare, overflow = _step_array(tortoise, a, b, c)
+    # Every lane starts and steps together, so Brent's power and lam are the same in all of them
+    power = lam = 1
+    hare_index = 1
+    # If mu + lam <= max_iterations, Brent meets before the hare passes this index
+    hare_limit = 3 * max_iterations + 2
+
+    found_lanes, found_lam = [], []
+    while lanes.size:
+        if overflow.any():
+            fallback[lanes[overflow]] = True
+            resume_value[lanes[overflow]] = previous[overflow]
+            resume_index[lanes[overflow]] = hare_index - 1
+        met = (hare == tortoise) & ~overflow
+        if met.any():
+            found_lanes.append(lanes[met])
+            found_lam.append(np.full(lanes[met].size, lam, dtype=np.int64))
+
+        if hare_index > hare_limit:
+            break  # remaining lanes stay 'max_iter'
+        keep = ~met & ~overflow
+        if not keep.all():
+            lanes, tortoise, hare = lanes[keep], tortoise[keep], hare[keep]
+
+        if lanes.size <= SCALAR_LANES:
+            for lane, lane_tortoise, lane_hare in zip(lanes, tortoise, hare):
+                outcome = _finish_brent(int(lane_tortoise), int(lane_hare), power, lam, hare_index, hare_limit,
+                                        a, b, c)
+                if outcome is None:
+                    continue
+                if outcome[0] == 'met':
+                    found_lanes.append(np.array([lane], dtype=np.int64))
+                    found_lam.append(np.array([outcome[1]], dtype=np.int64))
+                else:
+                    fallback[lane] = True
+                    resume_value[lane], resume_index[lane] = outcome[1], outcome[2]
+            break
+
+        if power == lam:
+            tortoise = hare
+            power *= 2
+            lam = 0
+
+        previous = hare
+        hare, overflow = _step_array(hare, a, b, c)
+        lam += 1
+        hare_index += 1
+
+    lanes = np.concatenate(found_lanes) if found_lanes else np.empty(0, dtype=np.int64)
+    lam = np.concatenate(found_lam) if found_lam else np.empty(0, dtype=np.int64)
+
+    # --- Phase 2: find mu, the index where the cycle starts ---
+    # Every value visited here was already visited by the hare, so nothing overflows.
+    tortoise = starts[lanes]
+    hare = _advance(tortoise, lam, a, b, c)
+    mu = np.zeros(lanes.size, dtype=np.int64)
+    idx = np.flatnonzero(tortoise != hare)
+    while idx.size:
+        tortoise[idx], _ = _step_array(tortoise[idx], a, b, c)
+        hare[idx], _ = _step_array(hare[idx], a, b, c)
+        mu[idx] += 1
+        idx = idx[(tortoise[idx] != hare[idx]) & (mu[idx] + lam[idx] <= max_iterations)]
+
+    # The scalar solver only sees the repeat if it happens within max_iterations steps
+    in_time = mu + lam <= max_iterations
+    lanes, lam, mu, tortoise = lanes[in_time], lam[in_time], mu[in_time], tortoise[in_time]
+
+    # --- Phase 3: walk the cycle once to see whether it contains 1 ---
+    has_one = tortoise == 1
+    walker = tortoise.copy()
+    idx = np.flatnonzero(lam > 1)
+    steps = np.ones(lanes.size, dtype=np.int64)
+    while idx.size:
+        walker[idx], _ = _step_array(walker[idx], a, b, c)
+        has_one[idx] |= walker[idx] == 1
+        steps[idx] += 1
+        idx = idx[steps[idx] < lam[idx]]
+
+    status[lanes] = np.where(has_one, CONVERGED, CYCLED)
+    length[lanes] = mu + lam + 1
+    cycle_start[lanes] = mu
+
+    # --- Overflowed lanes: exact Python-int path ---
+    # Values before the first overflow are all distinct (a repeat would make
+    # the overflowing value recur earlier) and far below DIVERGENCE_BOUND, so
+    # an overflow past max_iterations means 'max_iter'. Otherwise the lane
+    # resumes from its last int64 value.
+    for lane in np.flatnonzero(fallback):
+        if resume_index[lane] >= max_iterations:
+            continue
+        res = _probe_divergence(int(resume_value[lane]), a, b, c, max_iterations,
+                                start_index=int(resume_index[lane]))
+        if res is None:
+            res = generalized_collatz_summary(int(starts[lane]), a, b, c, max_iterations)
+        status[lane] = STATUS_CODES[res['status']]
+        length[lane] = res['length']
+        if res['cycle_start'] is not None:
+            cycle_start[lane] = res['cycle_start']
+
+    return {'status': status, 'length': length, 'cycle_start': cycle_start}
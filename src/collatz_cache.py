@@ -0,0 +1,127 @@
+from collections import OrderedDict
+from typing import Dict
+
+from .collatz_generators import collatz_step, DIVERGENCE_BOUND
+
+
+class CollatzOutcomeCache:
+    """
+    Per-parameter memo of trajectory outcomes for a fixed (a, b, c).
+
+    Trajectories from different starting values merge all the time, so every
+    value a walk passes through is stored as (status, steps, cycle id):
+    - for values that end in a cycle, steps is the distance to the cycle entry
+      and cycle id points at the cycle's (length, 'converged'/'cycled') record;
+    - for diverging values, steps is the distance to the first value above
+      DIVERGENCE_BOUND and cycle id is None.
+    A later walk that reaches a stored value finishes at once.
+
+    Tail values live in an LRU table capped at max_entries. Cycle members are
+    kept outside the LRU (cycles are short and the cycle-entry index depends on
+    seeing them), so they are never evicted.
+    """
+
+    def __init__(self, a: int, b: int, c: int, max_entries: int = 1000000):
+        self.params = (a, b, c)
+        self.max_entries = max_entries
+        self._tails = OrderedDict()
+        self._cycle_members = {}
+        self._cycles = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict:
+        """Hit/miss counters plus current table sizes."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'tail_entries': len(self._tails),
+            'cycle_entries': len(self._cycle_members),
+            'cycles': len(self._cycles),
+        }
+
+    def _lookup(self, value):
+        cycle_id = self._cycle_members.get(value)
+        if cycle_id is not None:
+            return (self._cycles[cycle_id][1], 0, cycle_id)
+        entry = self._tails.get(value)
+        if entry is not None:
+            self._tails.move_to_end(value)
+        return entry
+
+    def _store(self, value, entry):
+        self._tails[value] = entry
+        self._tails.move_to_end(value)
+        while len(self._tails) > self.max_entries:
+            self._tails.popitem(last=False)
+            self.evictions += 1
+
+    def outcome(self, n: int, max_iterations: int = 1000000) -> Dict:
+        """
+        Status and sequence length that generalized_collatz(n, a, b, c, max_iterations)
+        would return, reusing (and extending) the cached outcomes.
+        """
+        a, b, c = self.params
+        if n <= 0 or a <= 0:
+            return {'status': 'invalid_input', 'length': 0}
+
+        path = []
+        index = {}
+        current = n
+        i = 0
+        while True:
+            entry = self._lookup(current)
+            if entry is not None:
+                self.hits += 1
+                status, steps, cycle_id = entry
+                for k, value in enumerate(path):
+                    self._store(value, (status, i - k + steps, cycle_id))
+                return self._resolve(status, i + steps, cycle_id, max_iterations)
+
+            if current > DIVERGENCE_BOUND:
+                self.misses += 1
+                self._store(current, ('diverged', 0, None))
+                for k, value in enumerate(path):
+                    self._store(value, ('diverged', i - k, None))
+                return self._resolve('diverged', i, None, max_iterations)
+
+            if i >= max_iterations:
+                # Nothing is known about where this trajectory ends, so nothing is stored
+                self.misses += 1
+                return {'status': 'max_iter', 'length': max_iterations + 1}
+
+            path.append(current)
+            index[current] = i
+            next_val = collatz_step(current, a, b, c)
+
+            if next_val in index:
+                self.misses += 1
+                mu = index[next_val]
+                cycle = path[mu:]
+                status = 'converged' if 1 in cycle else 'cycled'
+                cycle_id = len(self._cycles)
+                self._cycles.append((len(cycle), status))
+                for value in cycle:
+                    self._cycle_members[value] = cycle_id
+                for k in range(mu):
+                    self._store(path[k], (status, mu - k, cycle_id))
+                return self._resolve(status, mu, cycle_id, max_iterations)
+
+            current = next_val
+            i += 1
+
+    def _resolve(self, status, steps, cycle_id, max_iterations):
+        """Applies the iteration budget of generalized_collatz to a known outcome."""
+        if status == 'diverged':
+            # The divergence check runs for indices 0 .. max_iterations - 1
+            if steps < max_iterations:
+                return {'status': 'diverged', 'length': steps + 1}
+            return {'status': 'max_iter', 'length': max_iterations + 1}
+
+        # The repeat is seen at index mu + lam, which must be within the budget
+        total = steps + self._cycles[cycle_id][0]
+        if total <= max_iterations:
+            return {'status': status, 'length': total + 1}
+        return {'status': 'max_iter', 'length': max_iterations + 1}
@@ -1,4 +1,136 @@
-from typing import Dict
+import functools
+from typing import Dict, Generator, Iterator, Optional, Tuple
+
+# Values above this are treated as divergent by every solver in the project
+DIVERGENCE_BOUND = 10**50
+
+def collatz_step(current: int, a: int, b: int, c: int) -> int:
+    """
+    One step of the MOD-BASED generalized Collatz map used by generalized_collatz.
+    n/a if a divides n, otherwise b*n + c with every factor of a divided out
+    (the standard (2, 3, 1) case keeps 3n+1 as is).
+    """
+    if current % a == 0:
+        return current // a
+
+    numerator = b * current + c
+    if a == 2 and b == 3 and c == 1:
+        return numerator
+
+    while numerator % a == 0 and numerator > 0:
+        numerator = numerator // a
+    return numerator
+
+def symbolic_steps(r: int, modulus: int, a: int, b: int, c: int, max_steps: int) -> Iterator[Tuple[int, int]]:
+    """
+    collatz_step applied to the whole class n = modulus*q + r (q >= 0) at once.
+
+    Yields (alpha, beta) after each step, the value then being alpha*q + beta.
+    x mod a is the same for every q while a divides alpha, so the branch (and
+    every division of the a^j shortcut) is known; the walk stops as soon as it
+    depends on q, or after max_steps. Needs b >= 1 and c >= 0 (positive values).
+    """
+    standard = a == 2 and b == 3 and c == 1
+    alpha, beta = modulus, r
+    for _ in range(max_steps):
+        if alpha % a != 0:
+            return
+        if beta % a == 0:
+            alpha, beta = alpha // a, beta // a
+        else:
+            alpha, beta = b * alpha, b * beta + c
+            if not standard:
+                while alpha % a == 0 and beta % a == 0:
+                    alpha, beta = alpha // a, beta // a
+                if alpha % a != 0:
+                    return  # whether a divides it again depends on q
+        yield alpha, beta
+
+
+# Largest number of residue classes (a^k) of a jump table
+JUMP_TABLE_CLASSES = 1 << 12
+
+
+@functools.lru_cache(maxsize=64)
+def jump_table(a: int, b: int, c: int, max_classes: int = JUMP_TABLE_CLASSES) -> Optional[Tuple[int, tuple]]:
+    """
+    Multi-step jumps for (a, b, c), cached per parameter set: (modulus, entries)
+    with modulus = a^k, or None when the map cannot be stepped symbolically
+    (a < 2, b < 1 or c < 0).
+
+    entries[r] covers n = modulus*q + r: (steps, alpha, beta, peak_alpha,
+    peak_beta) means the value steps steps on is alpha*q + beta, and no value
+    in between exceeds peak_alpha*q + peak_beta. None when not even one step
+    is known for the class.
+    """
+    if a < 2 or b < 1 or c < 0:
+        return None
+    k = 1
+    while a ** (k + 1) <= max_classes:
+        k += 1
+    modulus = a ** k
+
+    entries = []
+    for r in range(modulus):
+        # Every division uses up one of the k factors of a; runaway classes would never stop
+        steps = list(symbolic_steps(r, modulus, a, b, c, 4 * k))
+        if not steps:
+            entries.append(None)
+            continue
+        alpha, beta = steps[-1]
+        entries.append((len(steps), alpha, beta,
+                        max(step[0] for step in steps), max(step[1] for step in steps)))
+    return modulus, tuple(entries)
+
+
+def _probe_divergence(n: int, a: int, b: int, c: int, max_iterations: int,
+                      start_index: int = 0) -> Optional[Dict]:
+    """
+    Jumps along the trajectory of n with jump_table to find where it first
+    exceeds DIVERGENCE_BOUND, stepping one value at a time only where a jump
+    could pass the bound unseen.
+
+    Exact because no value can repeat before that index t: a repeat makes the
+    rest periodic, and the cycle member above the bound would come before t.
+    So the result is 'diverged' if t < max_iterations, otherwise 'max_iter'.
+    Returns None (undecided) if the jumps come back to a value seen at a
+    power-of-two checkpoint (the trajectory cycles) or pass max_iterations
+    first; the caller then runs the exact single-step search.
+
+    start_index: index of n in its trajectory, for resuming part-way through
+    (the argument above only needs the values from n on to be that trajectory's).
+    Without a jump table for (a, b, c) every step is a single step.
+    """
+    table = jump_table(a, b, c)
+    modulus, entries = table if table is not None else (1, None)
+
+    x, index = n, start_index
+    checkpoint, checkpoint_index = n, start_index
+    while x <= DIVERGENCE_BOUND:
+        if index >= max_iterations:
+            return None
+        entry = None
+        if entries is not None:
+            q, r = divmod(x, modulus)
+            entry = entries[r]
+        if entry is not None and entry[3] * q + entry[4] <= DIVERGENCE_BOUND:
+            steps, alpha, beta = entry[0], entry[1], entry[2]
+            x = alpha * q + beta
+            index += steps
+        else:
+            x = collatz_step(x, a, b, c)
+            index += 1
+        if x == checkpoint:
+            return None
+        if index - start_index >= 2 * (checkpoint_index - start_index) + 1:
+            checkpoint, checkpoint_index = x, index
+
+    if index < max_iterations:
+        return {'status': 'diverged', 'length': index + 1,
+                'cycle_start': None, 'cycle_length': None, 'cycle_min': None}
+    return {'status': 'max_iter', 'length': max_iterations + 1,
+            'cycle_start': None, 'cycle_length': None, 'cycle_min': None}
+
 
 def generalized_collatz(n: int, a: int, b: int, c: int, max_iterations: int = 1000000) -> Dict:
     """
@@ -19,21 +151,11 @@ def generalized_collatz(n: int, a: int, b: int, c: int, max_iterations: int = 10
     for i in range(max_iterations):
         
         # 1. Magnitude Safety Check
-        if current > 10**50:
+        if current > DIVERGENCE_BOUND:
             return {'sequence': sequence, 'status': 'diverged'}
             
         # --- Calculate Next Value (next_val) ---
-        if current % a == 0:
-            next_val = current // a
-        else:
-            numerator = b * current + c
-            
-            if a == 2 and b == 3 and c == 1:
-                next_val = numerator
-            else:
-                while numerator % a == 0 and numerator > 0:
-                    numerator = numerator // a
-                next_val = numerator
+        next_val = collatz_step(current, a, b, c)
 
         # 2. Cycle Detection (The ONLY termination check besides max_iter/divergence)
         if next_val in visited:
@@ -55,4 +177,117 @@ def generalized_collatz(n: int, a: int, b: int, c: int, max_iterations: int = 10
         visited[next_val] = len(sequence) - 1 # Store index of number
         current = next_val
         
-    return {'sequence': sequence, 'status': 'max_iter'}
\ No newline at end of file
+    return {'sequence': sequence, 'status': 'max_iter'}
+
+def generalized_collatz_summary(n: int, a: int, b: int, c: int, max_iterations: int = 1000000,
+                                jump: bool = False) -> Dict:
+    """
+    Constant-memory summary of generalized_collatz (same statuses, no sequence).
+
+    Uses Brent's cycle detection, so only a handful of integers are held at any
+    time instead of the full sequence plus a visited dict. Returns:
+    - 'status': same value generalized_collatz would return
+    - 'length': len(sequence) generalized_collatz would return
+    - 'cycle_start': index where the cycle begins (None unless converged/cycled)
+    - 'cycle_length', 'cycle_min': length and smallest value of the cycle (None unless converged/cycled)
+    Costs up to ~3x the steps of generalized_collatz when a cycle is found late.
+
+    jump=True first follows the trajectory with multi-step jumps (jump_table),
+    which settles diverging starts in a fraction of the steps; starts that
+    cycle or reach max_iterations then run the single-step search as usual,
+    so the result is the same either way.
+    """
+    if n <= 0 or a <= 0:
+        return {'status': 'invalid_input', 'length': 0,
+                'cycle_start': None, 'cycle_length': None, 'cycle_min': None}
+
+    def _no_cycle(status, length):
+        return {'status': status, 'length': length,
+                'cycle_start': None, 'cycle_length': None, 'cycle_min': None}
+
+    if max_iterations <= 0:
+        return _no_cycle('max_iter', 1)
+    if n > DIVERGENCE_BOUND:
+        return _no_cycle('diverged', 1)
+    if jump and jump_table(a, b, c) is not None:
+        probed = _probe_divergence(n, a, b, c, max_iterations)
+        if probed is not None:
+            return probed
+
+    # 1. Brent's search for the cycle length. The hare visits every index in
+    # order, so the first value above the bound is seen here; if it exists it
+    # always comes before the first repeat.
+    power = lam = 1
+    tortoise = n
+    hare = collatz_step(n, a, b, c)
+    hare_index = 1
+    while tortoise != hare:
+        if hare > DIVERGENCE_BOUND:
+            if hare_index < max_iterations:
+                return _no_cycle('diverged', hare_index + 1)
+            return _no_cycle('max_iter', max_iterations + 1)
+        # If mu + lam <= max_iterations the two meet before the hare passes this index
+        if hare_index > 3 * max_iterations + 2:
+            return _no_cycle('max_iter', max_iterations + 1)
+        if power == lam:
+            tortoise = hare
+            power *= 2
+            lam = 0
+        hare = collatz_step(hare, a, b, c)
+        lam += 1
+        hare_index += 1
+
+    # 2. Find mu, the first index of the cycle
+    tortoise = hare = n
+    for _ in range(lam):
+        hare = collatz_step(hare, a, b, c)
+    mu = 0
+    while tortoise != hare:
+        tortoise = collatz_step(tortoise, a, b, c)
+        hare = collatz_step(hare, a, b, c)
+        mu += 1
+
+    # generalized_collatz sees the repeat at index mu + lam
+    if mu + lam > max_iterations:
+        return _no_cycle('max_iter', max_iterations + 1)
+
+    # 3. Walk the cycle once for its minimum and whether it passes through 1
+    cycle_min = tortoise
+    contains_one = tortoise == 1
+    value = collatz_step(tortoise, a, b, c)
+    while value != tortoise:
+        cycle_min = min(cycle_min, value)
+        contains_one = contains_one or value == 1
+        value = collatz_step(value, a, b, c)
+
+    return {
+        'status': 'converged' if contains_one else 'cycled',
+        'length': mu + lam + 1,
+        'cycle_start': mu,
+        'cycle_length': lam,
+        'cycle_min': cycle_min,
+    }
+
+
+def iter_generalized_collatz(n: int, a: int, b: int, c: int, max_iterations: int = 1000000) -> Generator[int, None, Dict]:
+    """
+    Lazy version of generalized_collatz: yields the same sequence one value at a time.
+
+    The generator's return value (StopIteration.value, or the result of
+    `yield from`) is the generalized_collatz_summary dict with the final
+    'status', 'length' and cycle details.
+
+    Memory stays constant: a Brent summary pass finds where the sequence stops
+    first, then the values are regenerated and yielded, so no list or visited
+    set is ever built (at the cost of walking the trajectory twice).
+    """
+    summary = generalized_collatz_summary(n, a, b, c, max_iterations)
+    if summary['length'] == 0:
+        return summary
+
+    current = n
+    yield current
+    for _ in range(summary['length'] - 1):
+        current = collatz_step(current, a, b, c)
+        yield current
+    return summary
@@ -1,32 +1,289 @@
-from .collatz_generators import generalized_collatz # Now imports YOUR updated function
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 
-def measure_collatz_behavior(a, b, c, test_range=(1, 50)):
+import numpy as np
+
+from .collatz_generators import generalized_collatz, generalized_collatz_summary, iter_generalized_collatz # Now imports YOUR updated function
+from .collatz_batch import batch_generalized_collatz, CONVERGED, CYCLED, MAX_ITER, STATUS_NAMES
+from .collatz_preclassifier import preclassify_parameter_set, UNDECIDED
+from .collatz_sieve import sieve_applicable, sieve_outcomes
+
+def measure_collatz_behavior(a, b, c, test_range=(1, 50), max_iterations=1000000, engine='python', cache=None, store=None,
+                             counters=None, preclassify=True, workers=None):
     """
     Runs the sequence for a range of starting integers (n) to determine
     the convergence rate of the parameter set (a, b, c).
+
+    engine='python' runs generalized_collatz once per n. engine='numpy' steps
+    every n in test_range together with batch_generalized_collatz and gives
+    the same metrics, which is what makes large test ranges practical.
+    engine='summary' uses generalized_collatz_summary, which keeps memory
+    constant per n (useful for slowly cycling or max_iter parameter sets).
+    engine='jump' is 'summary' with multi-step jumps (generalized_collatz_summary(jump=True)):
+    about 5x faster for diverging parameter sets, somewhat slower for cycling ones.
+    engine='sieve' settles most n through a residue-class table instead of
+    simulating them (see src/collatz_sieve.py), for ranges of 10^7+ starting
+    values that begin near 1; calls it cannot handle run on the 'numpy' engine.
+
+    cache: optional CollatzOutcomeCache(a, b, c). When given, trajectories that
+    merge into an already-seen value finish at once instead of being re-walked;
+    pass the same cache to later calls to keep reusing it, and read
+    cache.stats() for hit/miss counts. Not available with engine='numpy'.
+
+    store: optional MetricsStore. Metrics already stored for the same
+    (a, b, c, test_range, max_iterations) are returned without simulating;
+    new results are written back.
+
+    counters: optional dict the run adds its work to: 'collatz_runs' (starting
+    values simulated), 'collatz_steps' (map steps over all of them),
+    'collatz_max_iter_hits' and 'store_hits'. Missing keys start at 0.
+    Starts decided by the pre-classifier are counted in 'collatz_preclassified',
+    and every parameter set it could (partly) decide in 'preclassifier.<reason>'.
+
+    preclassify: first runs preclassify_parameter_set (src/collatz_preclassifier.py)
+    and only simulates the starting values it leaves undecided; the metrics
+    are the same either way.
+
+    workers: splits test_range across that many processes with the NumPy
+    kernel (see collatz_distribution, which also returns the per-n arrays);
+    engine, cache and preclassify are then not used.
     """
+    if store is not None:
+        metrics = store.get(a, b, c, test_range, max_iterations)
+        if metrics is None:
+            metrics = measure_collatz_behavior(a, b, c, test_range, max_iterations, engine, cache, counters=counters,
+                                               preclassify=preclassify, workers=workers)
+            store.put(a, b, c, test_range, max_iterations, metrics)
+        elif counters is not None:
+            _add_counts(counters, store_hits=1)
+        return metrics
+
+    if workers is not None:
+        return collatz_distribution(a, b, c, test_range, max_iterations, workers, counters=counters)['metrics']
+
+    if cache is not None:
+        if engine not in ('python', 'summary'):
+            raise ValueError("The outcome cache is only supported with engine='python' or 'summary'.")
+        if cache.params != (a, b, c):
+            raise ValueError(f"Cache was built for {cache.params}, not {(a, b, c)}.")
+
+    if engine not in ('python', 'summary', 'jump', 'numpy', 'sieve'):
+        raise ValueError(f"Unknown engine '{engine}'. Use 'python', 'summary', 'jump', 'numpy' or 'sieve'.")
+    if engine == 'sieve':
+        if sieve_applicable(a, b, c, test_range, max_iterations):
+            return _measure_sieved(a, b, c, test_range, max_iterations, counters)
+        engine = 'numpy'
+
     results = {
         'converged': 0,
         'diverged_or_max': 0,
         'cycled': 0,
     }
+    starts = range(test_range[0], test_range[1])
+    if preclassify:
+        classification = preclassify_parameter_set(a, b, c, test_range)
+        starts = classification['undecided']
+        for status, count in classification['decided'].items():
+            results[status] += count
+        if counters is not None and classification['reason'] != UNDECIDED:
+            _add_counts(counters, collatz_preclassified=sum(classification['decided'].values()),
+                        **{f"preclassifier.{classification['reason']}": 1})
+
+    if engine == 'numpy':
+        return _measure_batched(a, b, c, starts, results, test_range, max_iterations, counters)
+
     total_steps_for_converged = 0
+    total_steps = 0
+    max_iter_hits = 0
     total_tests = test_range[1] - test_range[0]
     
-    for n in range(test_range[0], test_range[1]):
-        # Run simulation using YOUR updated function
-        res = generalized_collatz(n, a, b, c)
+    for n in starts:
+        if cache is not None:
+            res = cache.outcome(n, max_iterations)
+            length = res['length']
+        elif engine in ('summary', 'jump'):
+            res = generalized_collatz_summary(n, a, b, c, max_iterations, jump=engine == 'jump')
+            length = res['length']
+        else:
+            # Run simulation using YOUR updated function
+            res = generalized_collatz(n, a, b, c, max_iterations)
+            length = len(res['sequence'])
         status = res['status']
+        total_steps += max(length - 1, 0)
         
         if status == 'converged':
             results['converged'] += 1
             # Note: We use YOUR function's returned sequence length
-            total_steps_for_converged += len(res['sequence'])
+            total_steps_for_converged += length
         elif status == 'cycled':
             results['cycled'] += 1
         else: # 'diverged', 'max_iter', 'invalid_input'
             results['diverged_or_max'] += 1
+            if status == 'max_iter':
+                max_iter_hits += 1
+
+    if counters is not None:
+        _add_counts(counters, collatz_runs=len(starts), collatz_steps=total_steps,
+                    collatz_max_iter_hits=max_iter_hits)
+    return _summarize(results, total_steps_for_converged, total_tests)
+
+
+def _measure_batched(a, b, c, starts, results, test_range, max_iterations, counters=None):
+    """Vectorized path of measure_collatz_behavior (engine='numpy'), adding the outcomes of starts to results."""
+    total_tests = test_range[1] - test_range[0]
+    batch = batch_generalized_collatz(starts, a, b, c, max_iterations)
+    converged = batch['status'] == CONVERGED
+    cycled = batch['status'] == CYCLED
+
+    results['converged'] += int(converged.sum())
+    results['diverged_or_max'] += int((~converged & ~cycled).sum())
+    results['cycled'] += int(cycled.sum())
+    if counters is not None:
+        _add_counts(counters, collatz_runs=int(batch['length'].size),
+                    collatz_steps=int(np.maximum(batch['length'] - 1, 0).sum()),
+                    collatz_max_iter_hits=int((batch['status'] == MAX_ITER).sum()))
+    return _summarize(results, int(batch['length'][converged].sum()), total_tests)
+
+
+def _measure_sieved(a, b, c, test_range, max_iterations, counters=None):
+    """Residue-sieve path of measure_collatz_behavior (engine='sieve')."""
+    start, end = test_range
+    outcomes = sieve_outcomes(a, b, c, end, max_iterations, counters=counters)
+    status = outcomes['status'][max(start, 1) - 1:end - 1]
+    converged = status == CONVERGED
+    cycled = status == CYCLED
+
+    results = {
+        'converged': int(converged.sum()),
+        # Starts below 1 are 'invalid_input'
+        'diverged_or_max': int((~converged & ~cycled).sum()) + max(1 - start, 0),
+        'cycled': int(cycled.sum()),
+    }
+    total_steps_for_converged = int(outcomes['length'][max(start, 1) - 1:end - 1][converged].sum(dtype=np.int64))
+    return _summarize(results, total_steps_for_converged, end - start)
+
+
+# Starting values per work unit of collatz_distribution
+DISTRIBUTION_CHUNK_SIZE = 1 << 18
+
+
+def collatz_distribution(a, b, c, test_range=(1, 50), max_iterations=1000000, workers=None,
+                         chunk_size=DISTRIBUTION_CHUNK_SIZE, quantiles=(0.5, 0.9, 0.99), counters=None):
+    """
+    Per-n outcomes of one parameter set over a (large) test_range, computed in parallel.
+
+    The range is cut into chunks of chunk_size starts that a process pool runs
+    through batch_generalized_collatz (workers=None uses every core,
+    workers=1 runs in this process). Workers write their statuses and lengths
+    straight into shared-memory arrays and only send back a few counters, so
+    nothing per-n is pickled.
 
+    Returns:
+    - 'status', 'length': one entry per n in test_range (collatz_batch status
+      codes, and the len(sequence) generalized_collatz would return)
+    - 'metrics': the measure_collatz_behavior dict for the same range
+    - 'status_counts': number of starts per status name
+    - 'length_histogram': {'converged': ..., 'cycled': ...}, np.bincount of
+      the sequence lengths of those starts (index = length)
+    - 'length_quantiles': {'converged': ..., 'cycled': ...}, {q: length} for
+      every q in quantiles (empty if no start has that status)
+    Lengths are counted like avg_steps_to_one, which is the converged mean.
+    counters: as for measure_collatz_behavior.
+    """
+    start, end = test_range
+    count = max(end - start, 0)
+    chunks = [(lo, min(lo + chunk_size, end)) for lo in range(start, end, chunk_size)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(chunks) <= 1:
+        status = np.empty(count, dtype=np.int8)
+        length = np.empty(count, dtype=np.int64)
+        chunk_counts = [_fill_chunk(status[lo - start:hi - start], length[lo - start:hi - start],
+                                    lo, hi, a, b, c, max_iterations) for lo, hi in chunks]
+    else:
+        status_shm = shared_memory.SharedMemory(create=True, size=max(count, 1))
+        length_shm = shared_memory.SharedMemory(create=True, size=max(count, 1) * 8)
+        try:
+            work_units = [(status_shm.name, length_shm.name, start, count, lo, hi, a, b, c, max_iterations)
+                          for lo, hi in chunks]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunk_counts = list(executor.map(_distribution_chunk, work_units))
+            # Copied out so the shared blocks can be released
+            status = np.ndarray(count, dtype=np.int8, buffer=status_shm.buf).copy()
+            length = np.ndarray(count, dtype=np.int64, buffer=length_shm.buf).copy()
+        finally:
+            for shm in (status_shm, length_shm):
+                shm.close()
+                shm.unlink()
+
+    if counters is not None:
+        for chunk in chunk_counts:
+            _add_counts(counters, **chunk)
+
+    converged = status == CONVERGED
+    cycled = status == CYCLED
+    results = {
+        'converged': int(converged.sum()),
+        'diverged_or_max': int((~converged & ~cycled).sum()),
+        'cycled': int(cycled.sum()),
+    }
+    return {
+        'status': status,
+        'length': length,
+        'metrics': _summarize(results, int(length[converged].sum()), end - start),
+        'status_counts': {name: int((status == code).sum()) for code, name in enumerate(STATUS_NAMES)},
+        'length_histogram': {name: np.bincount(length[mask]) for name, mask in
+                             (('converged', converged), ('cycled', cycled))},
+        'length_quantiles': {name: _quantiles(length[mask], quantiles) for name, mask in
+                             (('converged', converged), ('cycled', cycled))},
+    }
+
+
+def _distribution_chunk(work_unit):
+    """Worker entry point of collatz_distribution: fills one chunk of the shared arrays."""
+    status_name, length_name, start, count, lo, hi, a, b, c, max_iterations = work_unit
+    status_shm = shared_memory.SharedMemory(name=status_name)
+    length_shm = shared_memory.SharedMemory(name=length_name)
+    try:
+        status = np.ndarray(count, dtype=np.int8, buffer=status_shm.buf)
+        length = np.ndarray(count, dtype=np.int64, buffer=length_shm.buf)
+        chunk_counts = _fill_chunk(status[lo - start:hi - start], length[lo - start:hi - start],
+                                   lo, hi, a, b, c, max_iterations)
+        # The views must go before the blocks can be closed
+        del status, length
+        return chunk_counts
+    finally:
+        status_shm.close()
+        length_shm.close()
+
+
+def _fill_chunk(status, length, lo, hi, a, b, c, max_iterations):
+    """Runs the starts lo..hi-1 and writes their outcomes into the given array slices. Returns counters."""
+    batch = batch_generalized_collatz(range(lo, hi), a, b, c, max_iterations)
+    status[:] = batch['status']
+    length[:] = batch['length']
+    return {
+        'collatz_runs': hi - lo,
+        'collatz_steps': int(np.maximum(batch['length'] - 1, 0).sum()),
+        'collatz_max_iter_hits': int((batch['status'] == MAX_ITER).sum()),
+    }
+
+
+def _quantiles(values, quantiles):
+    if not values.size:
+        return {}
+    return {q: float(v) for q, v in zip(quantiles, np.quantile(values, quantiles))}
+
+
+def _add_counts(counters, **counts):
+    for name, value in counts.items():
+        counters[name] = counters.get(name, 0) + value
+
+
+def _summarize(results, total_steps_for_converged, total_tests):
+    """Turns raw status counts into the rate dict returned by measure_collatz_behavior."""
     # Calculate metrics
     convergence_rate = results['converged'] / total_tests if total_tests > 0 else 0
     avg_steps = total_steps_for_converged / results['converged'] if results['converged'] > 0 else 0
@@ -37,3 +294,47 @@ def measure_collatz_behavior(a, b, c, test_range=(1, 50)):
         'cycle_rate': (results['cycled'] / total_tests),
         'avg_steps_to_one': avg_steps
     }
+
+
+def stream_trajectory_stats(n, a, b, c, max_iterations=1000000, keep_parity=False):
+    """
+    On-the-fly statistics for one trajectory, consumed from iter_generalized_collatz
+    so long (divergent / max_iter) trajectories never sit in memory as a list.
+
+    Returns the final status and length plus:
+    - 'peak': largest value reached
+    - 'leading_digits': Benford histogram, counts of leading digits 1-9 (zeros skipped)
+    - 'odd_fraction': share of odd values in the trajectory
+    - 'parity': bytearray of value % 2 per step (only if keep_parity=True)
+    """
+    peak = None
+    leading_digits = [0] * 9
+    odd_count = 0
+    parity = bytearray() if keep_parity else None
+
+    trajectory = iter_generalized_collatz(n, a, b, c, max_iterations)
+    while True:
+        try:
+            value = next(trajectory)
+        except StopIteration as stop:
+            summary = stop.value
+            break
+
+        if peak is None or value > peak:
+            peak = value
+        if value != 0:
+            leading_digits[int(str(abs(value))[0]) - 1] += 1
+        is_odd = value % 2
+        odd_count += is_odd
+        if keep_parity:
+            parity.append(is_odd)
+
+    length = summary['length']
+    return {
+        'status': summary['status'],
+        'length': length,
+        'peak': peak,
+        'leading_digits': leading_digits,
+        'odd_fraction': odd_count / length if length > 0 else 0,
+        'parity': parity,
+    }
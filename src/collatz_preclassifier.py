@@ -0,0 +1,163 @@
+import functools
+import math
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from .collatz_generators import collatz_step, symbolic_steps
+
+# Reason codes of preclassify_parameter_set
+INVALID_DIVISOR = 'invalid_divisor'      # a <= 0: every start is 'invalid_input'
+RUNAWAY_RESIDUES = 'runaway_residues'    # every start is trapped in a runaway residue class
+PARTIAL_RUNAWAY = 'partial_runaway'      # some starts are trapped, the others are simulated
+UNDECIDED = 'undecided'                  # nothing is known, every start is simulated
+
+REASON_CODES = (INVALID_DIVISOR, RUNAWAY_RESIDUES, PARTIAL_RUNAWAY, UNDECIDED)
+
+# Largest number of residue classes (a^k) runaway_classes looks at
+RUNAWAY_CLASSES = 1 << 12
+
+# Steps followed from each start to the first value in a runaway class
+PREFIX_STEPS = 64
+
+
+def runaway_residues(a: int, b: int, c: int) -> FrozenSet[int]:
+    """
+    Nonzero residues r mod a from which b*n + c never becomes a multiple of a.
+
+    For n not divisible by a, collatz_step computes b*n + c and then divides
+    out every factor of a; when (b*r + c) mod a is nonzero there is nothing to
+    divide, so the next value is exactly b*n + c, with that residue. A residue
+    whose orbit under r -> (b*r + c) mod a never reaches 0 therefore keeps the
+    trajectory on the b*n + c branch forever. Whether 0 is reachable is a gcd question:
+    b*r + c = 0 (mod a) is solvable only when gcd(b, a) divides c, and the
+    orbit must also pass through a solution.
+
+    With b*n + c > n for every n >= 1 (b >= 1, c >= 0, b + c >= 2) such a
+    trajectory strictly increases, never repeats a value and ends as
+    'diverged' or 'max_iter'. Returns an empty set when that growth guarantee
+    does not hold or a < 2.
+    """
+    if a < 2 or b < 1 or c < 0 or b + c < 2:
+        return frozenset()
+
+    runaway = set()
+    reaches_zero = {0}
+    for start in range(1, a):
+        orbit = []
+        r = start
+        while r not in runaway and r not in reaches_zero and r not in orbit:
+            orbit.append(r)
+            r = (b * r + c) % a
+        # The orbit ended in a known class, or closed a loop that avoids 0
+        (reaches_zero if r in reaches_zero else runaway).update(orbit)
+    return frozenset(runaway)
+
+
+@functools.lru_cache(maxsize=64)
+def runaway_classes(a: int, b: int, c: int, max_classes: int = RUNAWAY_CLASSES) -> Tuple[int, FrozenSet[int]]:
+    """
+    Residue classes n = modulus*q + r (modulus = a^k) that trajectories
+    never leave once they enter, with every value larger than the one before.
+
+    Working mod a^k also sees the divisions of collatz_step: for (2, 2, 4)
+    an odd n goes to (2n + 4) / 2 = n + 2, so every odd class runs away
+    although 2*1 + 4 is even. symbolic_steps gives the value after one step
+    of class r as alpha*q + beta. The class is a candidate when that step
+    is known for every q, is not a division and grows (alpha >= modulus,
+    beta > r); its next values then cover the classes beta mod
+    gcd(alpha, modulus). The largest set of candidates whose next classes
+    all stay inside it is returned as (modulus, residues); it contains the
+    lift of runaway_residues. (1, frozenset()) when the growth guarantee of
+    runaway_residues does not hold or a < 2.
+    """
+    if a < 2 or b < 1 or c < 0 or b + c < 2:
+        return 1, frozenset()
+    modulus = a
+    while modulus * a <= max_classes:
+        modulus *= a
+
+    # Candidates waiting on the classes t mod g: {(g, t): [r, ...]}
+    waiting = {}
+    candidates = set()
+    for r in range(modulus):
+        if r % a == 0:
+            continue
+        step = next(symbolic_steps(r, modulus, a, b, c, 1), None)
+        if step is None or step[0] < modulus or step[1] <= r:
+            continue
+        g = math.gcd(step[0], modulus)
+        waiting.setdefault((g, step[1] % g), []).append(r)
+        candidates.add(r)
+
+    # Drop candidates that can reach a dropped class until none are left to drop
+    moduli = {g for g, _ in waiting}
+    dropped = [r for r in range(modulus) if r not in candidates]
+    while dropped:
+        r = dropped.pop()
+        for g in moduli:
+            for waiter in waiting.pop((g, r % g), ()):
+                if waiter in candidates:
+                    candidates.remove(waiter)
+                    dropped.append(waiter)
+    return modulus, frozenset(candidates)
+
+
+def is_runaway_start(n: int, a: int, b: int, c: int, classes: Tuple[int, FrozenSet[int]],
+                     known: Optional[Dict[int, bool]] = None, max_steps: int = PREFIX_STEPS) -> bool:
+    """
+    True when the trajectory of n provably never stops before the divergence
+    bound or max_iter: within max_steps steps it reaches a value in one of
+    the runaway classes (modulus, residues) of runaway_classes. The values
+    before it lie outside those classes and every value after it is larger
+    than the last inside them, so no value ever repeats.
+
+    known maps smaller starts to their result; a trajectory that drops to
+    one of them has that start's trajectory as its tail and takes its result.
+    """
+    modulus, residues = classes
+    if n <= 0 or not residues:
+        return False
+    x = n
+    for _ in range(max_steps):
+        if x % modulus in residues:
+            return True
+        if known is not None and x < n and x in known:
+            return known[x]
+        x = collatz_step(x, a, b, c)
+    return False
+
+
+def preclassify_parameter_set(a: int, b: int, c: int, test_range=(1, 50)) -> Dict:
+    """
+    Decides as many starting values of measure_collatz_behavior as possible
+    without simulating them.
+
+    Only exact arguments are used, so the metrics come out the same as a
+    full simulation. Growth heuristics such as b / a^E[k] > 1 only make
+    divergence likely, so they are not used; the runaway classes above are
+    the part of them that holds for every start (see is_runaway_start).
+
+    Returns:
+    - 'reason': one of REASON_CODES
+    - 'decided': {status: number of starts} known without simulation, where
+      'diverged_or_max' covers runaway starts (diverged or max_iter, which
+      measure_collatz_behavior counts together) and invalid ones
+    - 'undecided': the starting values that still need simulating
+    """
+    starts = range(test_range[0], test_range[1])
+    if a <= 0:
+        return {'reason': INVALID_DIVISOR, 'decided': {'diverged_or_max': len(starts)}, 'undecided': []}
+
+    classes = runaway_classes(a, b, c)
+    # Increasing order, so every smaller start in the range is already known
+    known = {}
+    for n in starts:
+        known[n] = is_runaway_start(n, a, b, c, classes, known)
+    undecided = [n for n in starts if not known[n]]
+    num_runaway = len(starts) - len(undecided)
+    if num_runaway == 0:
+        reason = UNDECIDED
+    elif undecided:
+        reason = PARTIAL_RUNAWAY
+    else:
+        reason = RUNAWAY_RESIDUES
+    return {'reason': reason, 'decided': {'diverged_or_max': num_runaway}, 'undecided': undecided}
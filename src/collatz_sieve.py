@@ -0,0 +1,234 @@
+from typing import Dict
+
+import numpy as np
+
+from .collatz_batch import batch_generalized_collatz, CONVERGED, CYCLED, MAX_ITER, STATUS_NAMES
+from .collatz_generators import DIVERGENCE_BOUND, symbolic_steps
+from .collatz_preclassifier import runaway_residues
+
+# Largest number of residue classes (a^k) the sieve table is built for
+DEFAULT_MAX_CLASSES = 1 << 16
+
+# Starting values handled per vectorized block
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+# Pre-drop values are only trusted while they provably stay below this (fits
+# int64 and is far below DIVERGENCE_BOUND, so no start is cut off on the way)
+_SAFE_PEAK = 2 ** 62
+assert _SAFE_PEAK < DIVERGENCE_BOUND
+
+_STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+_DIVERGED = _STATUS_CODES['diverged']
+
+
+def sieve_applicable(a: int, b: int, c: int, test_range, max_iterations: int) -> bool:
+    """
+    Whether engine='sieve' can handle this call. The sieve needs a >= 2,
+    b >= 1, c >= 0 (so values stay positive) and max_iterations > 0, and
+    keeps outcomes for every value below test_range[1], so the range has to
+    cover at least half of [1, test_range[1]).
+    """
+    start, end = test_range
+    return (a >= 2 and b >= 1 and c >= 0 and max_iterations > 0
+            and end > 1 and max(start, 1) <= end - max(start, 1))
+
+
+def build_sieve_table(a: int, b: int, c: int, max_classes: int = DEFAULT_MAX_CLASSES) -> Dict:
+    """
+    Residue-class table for n = A*q + r with A = a^k, the largest power of a
+    with at most max_classes classes.
+
+    The map is applied to the whole class symbolically (symbolic_steps) and
+    each step's value alpha*q + beta is compared with n = A*q + r. The class is sieved at step j
+    when, for every q >= q0, the values at steps 1..j-1 are >= n and the
+    value at step j is < n: j is then the first drop below the start, and
+    the value there is alpha_j*q + beta_j.
+
+    Returns arrays indexed by r: 'drop_step' (0 = not sieved), 'alpha',
+    'beta', 'min_q' and the coefficients 'peak_alpha' / 'peak_beta' of an
+    upper bound on the values before the drop; plus 'modulus' (A).
+    """
+    k = 1
+    while a ** (k + 1) <= max_classes:
+        k += 1
+    modulus = a ** k
+
+    table = {
+        'modulus': modulus,
+        'drop_step': np.zeros(modulus, dtype=np.int64),
+        'alpha': np.zeros(modulus, dtype=np.int64),
+        'beta': np.zeros(modulus, dtype=np.int64),
+        'min_q': np.zeros(modulus, dtype=np.int64),
+        'peak_alpha': np.zeros(modulus, dtype=np.float64),
+        'peak_beta': np.zeros(modulus, dtype=np.float64),
+    }
+    # Every division uses up one of the k factors of a; runaway classes would never stop
+    max_steps = 4 * k
+    for r in range(modulus):
+        sieved = _sieve_class(r, modulus, a, b, c, max_steps)
+        if sieved is not None:
+            for name, value in sieved.items():
+                table[name][r] = value
+    return table
+
+
+def _sieve_class(r, modulus, a, b, c, max_steps):
+    """Drop step and coefficients for the class n = modulus*q + r (see build_sieve_table), or None."""
+    min_q = 1 if r == 0 else 0
+    peak_alpha, peak_beta = modulus, r
+    for step, (alpha, beta) in enumerate(symbolic_steps(r, modulus, a, b, c, max_steps), start=1):
+        if alpha < modulus or (alpha == modulus and beta < r):
+            # Below n from q >= min_q on: the first drop
+            if beta >= r and alpha < modulus:
+                min_q = max(min_q, (beta - r) // (modulus - alpha) + 1)
+            if max(peak_beta, beta) >= _SAFE_PEAK:
+                return None
+            return {'drop_step': step, 'alpha': alpha, 'beta': beta, 'min_q': min(min_q, _SAFE_PEAK),
+                    'peak_alpha': peak_alpha, 'peak_beta': peak_beta}
+
+        # At or above n from q >= min_q on
+        if beta < r:
+            min_q = max(min_q, -(-(r - beta) // (alpha - modulus)))
+        peak_alpha, peak_beta = max(peak_alpha, alpha), max(peak_beta, beta)
+    return None
+
+
+def sieve_outcomes(a: int, b: int, c: int, end: int, max_iterations: int = 1000000,
+                   max_classes: int = DEFAULT_MAX_CLASSES, block_size: int = DEFAULT_BLOCK_SIZE,
+                   counters=None) -> Dict:
+    """
+    Status code and sequence length (as batch_generalized_collatz) of every
+    start n in [1, end), index n - 1. Needs sieve_applicable.
+
+    Starts are handled in increasing blocks. A start in a sieved class drops
+    to m < n after j steps with every earlier value >= n. m's outcome is
+    already known, so n's follows from it: same final status (unless the
+    extra j steps push it past max_iterations) and length j + length(m).
+    Starts trapped in a runaway residue class (see collatz_preclassifier) are
+    'diverged' or 'max_iter' without simulating (see _runaway_outcomes). Everything else (unsieved
+    classes, q below the class's min_q, starts whose m sits on a cycle,
+    where the cycle entry index would be wrong) is simulated with
+    batch_generalized_collatz.
+
+    Memory is about 5 bytes per value below end (int8 status, int32 length).
+
+    counters: optional dict; adds 'collatz_runs' / 'collatz_steps' /
+    'collatz_max_iter_hits' for simulated starts, 'collatz_sieved' and
+    'collatz_preclassified' for the others.
+    """
+    table = build_sieve_table(a, b, c, max_classes)
+    modulus = table['modulus']
+    runaway = np.zeros(a, dtype=bool)
+    runaway[list(runaway_residues(a, b, c))] = True
+
+    count = max(end - 1, 0)
+    status = np.zeros(count, dtype=np.int8)
+    length = np.zeros(count, dtype=np.int32 if max_iterations < 2 ** 31 - 1 else np.int64)
+    # Cycle members (cycle start index 0) are kept apart, see above
+    on_cycle = np.zeros(count, dtype=bool)
+    totals = {'collatz_runs': 0, 'collatz_steps': 0, 'collatz_max_iter_hits': 0,
+              'collatz_sieved': 0, 'collatz_preclassified': 0}
+
+    for lo in range(1, end, block_size):
+        n = np.arange(lo, min(lo + block_size, end), dtype=np.int64)
+        q, r = np.divmod(n, modulus)
+        drop_step = table['drop_step'][r]
+        sieved = ((drop_step > 0) & (q >= table['min_q'][r])
+                  & (table['peak_alpha'][r] * q + table['peak_beta'][r] < _SAFE_PEAK))
+        drop_to = np.where(sieved, table['alpha'][r] * q + table['beta'][r], 0)
+
+        # Runaway starts: first value not divisible by a (n / a^i) in a runaway residue
+        core = n.copy()
+        divisions = np.zeros(n.size, dtype=np.int64)
+        idx = np.flatnonzero(core % a == 0)
+        while idx.size:
+            core[idx] //= a
+            divisions[idx] += 1
+            idx = idx[core[idx] % a == 0]
+        trapped = ~sieved & runaway[core % a]
+        status[n[trapped] - 1], length[n[trapped] - 1] = _runaway_outcomes(core[trapped], divisions[trapped], b, c,
+                                                                           max_iterations)
+        totals['collatz_preclassified'] += int(trapped.sum())
+
+        known = trapped.copy()
+        _simulate(n, np.flatnonzero(~sieved & ~trapped), known, a, b, c, max_iterations,
+                  status, length, on_cycle, totals)
+
+        # Sieved starts, once their m is known. An m inside the block belongs to
+        # a smaller start, so every pass resolves at least the smallest one left.
+        pending = np.flatnonzero(sieved)
+        while pending.size:
+            m = drop_to[pending]
+            inside = m >= lo
+            ready = ~inside | known[np.where(inside, m - lo, 0)]
+            idx, m = pending[ready], m[ready]
+            cycle_hit = on_cycle[m - 1]
+            _simulate(n, idx[cycle_hit], known, a, b, c, max_iterations, status, length, on_cycle, totals)
+            idx, m = idx[~cycle_hit], m[~cycle_hit]
+            status[n[idx] - 1], length[n[idx] - 1] = _extend(status[m - 1], length[m - 1], drop_step[idx],
+                                                               max_iterations)
+            known[idx] = True
+            totals['collatz_sieved'] += idx.size
+            pending = pending[~ready]
+
+    if counters is not None:
+        for name, value in totals.items():
+            counters[name] = counters.get(name, 0) + value
+    return {'status': status, 'length': length}
+
+
+def _runaway_outcomes(core, divisions, b, c, max_iterations):
+    """
+    Status and length of runaway starts, from their first value x0 not
+    divisible by a (core, reached after divisions steps). From there every
+    step is exactly x -> b*x + c, so the value t steps later is
+    b^t*x0 + c*(b^t - 1)/(b - 1) and the first t where it exceeds
+    DIVERGENCE_BOUND follows in closed form. No value repeats before that
+    index, so the start is 'diverged' if it is below max_iterations, else
+    'max_iter' (as generalized_collatz_summary).
+    """
+    if b == 1:
+        steps = np.array([min((DIVERGENCE_BOUND - int(x)) // c + 1, max_iterations) for x in core], dtype=np.int64)
+    else:
+        # x0 exceeds the bound after t steps exactly when x0 > thresholds[t] (decreasing in t)
+        thresholds, power, offset = [], 1, 0
+        while True:
+            threshold = (DIVERGENCE_BOUND - offset) // power
+            thresholds.append(min(max(threshold, 0), np.iinfo(np.int64).max))
+            if threshold < 1:
+                break
+            power, offset = power * b, offset * b + c
+        # Number of thresholds >= x0, i.e. the first t with x0 > thresholds[t]
+        steps = np.searchsorted(-np.array(thresholds, dtype=np.int64), -core, side='right')
+        steps = np.minimum(steps, max_iterations)
+    crossing = divisions + steps
+    diverged = crossing < max_iterations
+    return (np.where(diverged, _DIVERGED, MAX_ITER).astype(np.int8),
+            np.where(diverged, crossing + 1, max_iterations + 1))
+
+
+def _simulate(n, idx, known, a, b, c, max_iterations, status, length, on_cycle, totals):
+    """Runs the starts n[idx] through batch_generalized_collatz and marks them known."""
+    if not idx.size:
+        return
+    batch = batch_generalized_collatz(n[idx], a, b, c, max_iterations)
+    status[n[idx] - 1] = batch['status']
+    length[n[idx] - 1] = batch['length']
+    on_cycle[n[idx] - 1] = batch['cycle_start'] == 0
+    known[idx] = True
+    totals['collatz_runs'] += idx.size
+    totals['collatz_steps'] += int(np.maximum(batch['length'] - 1, 0).sum())
+    totals['collatz_max_iter_hits'] += int((batch['status'] == MAX_ITER).sum())
+
+
+def _extend(m_status, m_length, steps, max_iterations):
+    """Status and length of starts that reach values with these outcomes after steps extra steps."""
+    new_length = m_length.astype(np.int64) + steps
+    ends_in_cycle = (m_status == CONVERGED) | (m_status == CYCLED)
+    # generalized_collatz needs the repeat within max_iterations steps, and
+    # sees a value above the bound only at indices below max_iterations
+    in_time = np.where(ends_in_cycle, new_length - 1 <= max_iterations,
+                       (m_status == _DIVERGED) & (new_length - 1 < max_iterations))
+    new_status = np.where(in_time, m_status, MAX_ITER).astype(np.int8)
+    new_length = np.where(in_time, new_length, max_iterations + 1)
+    return new_status, new_length
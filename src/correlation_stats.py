@@ -0,0 +1,165 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+import numpy as np
+from scipy.stats import kendalltau, rankdata
+
+# Resampled values (resamples x samples) held in memory per chunk
+DEFAULT_CHUNK_ELEMENTS = 1 << 23
+
+
+def correlation_significance(x, ys: Dict[str, np.ndarray], n_permutations: int = 10000, n_bootstrap: int = 10000,
+                             confidence: float = 0.95, seed: int = 0, workers: int = 1,
+                             chunk_elements: int = DEFAULT_CHUNK_ELEMENTS) -> Dict[str, Dict]:
+    """
+    Resampling significance of the correlation between x and every series in ys.
+
+    All hypotheses are tested together. Each chunk of resamples is a matrix
+    and every correlation comes out of matrix products of sums:
+    - permutation test (n_permutations shuffles of x, two-sided) for Pearson
+      and Spearman (Pearson on ranks; shuffling x keeps its ranks)
+    - bootstrap percentile interval (n_bootstrap resamples of the rows,
+      drawn as row counts) for Pearson
+    Kendall's tau and its p-value come from scipy.
+
+    Chunks hold about chunk_elements resampled values, so memory does not
+    grow with the number of resamples. Each chunk draws from its own
+    generator spawned from seed, so results do not depend on workers
+    (processes to spread the chunks over).
+
+    Returns {name: {'pearson_r', 'pearson_p_permutation', 'pearson_ci',
+    'pearson_ci_resamples', 'spearman_rho', 'spearman_p_permutation',
+    'kendall_tau', 'kendall_p'}}.
+    Correlations with a constant series are NaN. A bootstrap resample without
+    spread in x or in y has no Pearson r, so 'pearson_ci' is the interval over
+    the other resamples only (conditional on spread); 'pearson_ci_resamples'
+    is how many of the n_bootstrap resamples it is based on. Nearly constant
+    series (e.g. escape times almost all at max_iter) can lose many of them.
+    The interval is NaN when none are left.
+    """
+    names = list(ys)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.column_stack([np.asarray(ys[name], dtype=np.float64) for name in names])
+    n = x.size
+    # Centered data keeps the sums small and the correlations accurate
+    x_centered, y_centered = x - x.mean(), y - y.mean(axis=0)
+    x_ranks = rankdata(x)
+    x_ranks -= x_ranks.mean()
+    y_ranks = rankdata(y, axis=0)
+    y_ranks -= y_ranks.mean(axis=0)
+
+    pearson = _pearson_rows(x_centered[None, :], y_centered)[0]
+    spearman = _pearson_rows(x_ranks[None, :], y_ranks)[0]
+
+    rows_per_chunk = max(1, chunk_elements // max(n, 1))
+    permutation_chunks = _chunk_sizes(n_permutations, rows_per_chunk)
+    bootstrap_chunks = _chunk_sizes(n_bootstrap, rows_per_chunk)
+    chunk_seeds = np.random.SeedSequence(seed).spawn(len(permutation_chunks) + len(bootstrap_chunks))
+    work_units = (
+        [('permutation', size, chunk_seed, x_centered, y_centered, x_ranks, y_ranks, pearson, spearman)
+         for size, chunk_seed in zip(permutation_chunks, chunk_seeds)]
+        + [('bootstrap', size, chunk_seed, x_centered, y_centered)
+           for size, chunk_seed in zip(bootstrap_chunks, chunk_seeds[len(permutation_chunks):])]
+    )
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(work_units) <= 1:
+        chunk_results = list(map(_resample_chunk, work_units))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_results = list(executor.map(_resample_chunk, work_units))
+
+    pearson_hits = np.zeros(len(names), dtype=np.int64)
+    spearman_hits = np.zeros(len(names), dtype=np.int64)
+    bootstrap = [np.empty((0, len(names)))]
+    for unit, result in zip(work_units, chunk_results):
+        if unit[0] == 'permutation':
+            pearson_hits += result[0]
+            spearman_hits += result[1]
+        else:
+            bootstrap.append(result)
+    bootstrap = np.concatenate(bootstrap)
+
+    alpha = (1 - confidence) / 2
+    results = {}
+    for i, name in enumerate(names):
+        finite = bootstrap[:, i][~np.isnan(bootstrap[:, i])]
+        ci = tuple(float(v) for v in np.quantile(finite, [alpha, 1 - alpha])) if finite.size else (np.nan, np.nan)
+        tau, tau_p = kendalltau(x, y[:, i])
+        results[name] = {
+            'pearson_r': float(pearson[i]),
+            'pearson_p_permutation': _p_value(pearson[i], pearson_hits[i], n_permutations),
+            'pearson_ci': ci,
+            'pearson_ci_resamples': int(finite.size),
+            'spearman_rho': float(spearman[i]),
+            'spearman_p_permutation': _p_value(spearman[i], spearman_hits[i], n_permutations),
+            'kendall_tau': float(tau),
+            'kendall_p': float(tau_p),
+        }
+    return results
+
+
+def _p_value(observed: float, hits: int, n_permutations: int) -> float:
+    # The observed pairing counts as one of the permutations
+    if np.isnan(observed) or n_permutations <= 0:
+        return float('nan')
+    return float((hits + 1) / (n_permutations + 1))
+
+
+def _chunk_sizes(total: int, per_chunk: int):
+    return [min(per_chunk, total - start) for start in range(0, total, per_chunk)]
+
+
+def _resample_chunk(work_unit):
+    """
+    Worker entry point: one chunk of resamples.
+    Permutation chunks return, per hypothesis, how many shuffles reached
+    |r| >= |observed r| (Pearson, Spearman); bootstrap chunks return the
+    resampled Pearson r of every hypothesis (resamples x hypotheses).
+    """
+    kind, size, chunk_seed = work_unit[:3]
+    rng = np.random.default_rng(chunk_seed)
+    if kind == 'permutation':
+        x, y, x_ranks, y_ranks, pearson, spearman = work_unit[3:]
+        # Same shuffles for values and ranks
+        order = rng.permuted(np.broadcast_to(np.arange(x.size), (size, x.size)), axis=1)
+        return (_exceedances(_pearson_rows(x[order], y), pearson),
+                _exceedances(_pearson_rows(x_ranks[order], y_ranks), spearman))
+
+    x, y = work_unit[3:]
+    n = x.size
+    # Row counts of each resample (much faster than rng.multinomial over n categories)
+    draws = rng.integers(0, n, size=(size, n), dtype=np.int64) + (np.arange(size, dtype=np.int64) * n)[:, None]
+    counts = np.bincount(draws.ravel(), minlength=size * n).reshape(size, n).astype(np.float64)
+    return _weighted_pearson(counts, x, y)
+
+
+def _pearson_rows(x_rows: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Pearson r of every row of x_rows (a permutation of centered x) with every centered column of y."""
+    covariance = x_rows @ y
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return covariance / np.sqrt(np.sum(x_rows ** 2, axis=1)[:, None] * np.sum(y ** 2, axis=0)[None, :])
+
+
+def _weighted_pearson(counts: np.ndarray, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Pearson r of each bootstrap resample (a row of row counts) with every column of y, from sums."""
+    n = x.size
+    sum_x, sum_xx = counts @ x, counts @ (x * x)
+    sum_y, sum_yy = counts @ y, counts @ (y * y)
+    sum_xy = counts @ (x[:, None] * y)
+    spread_x = n * sum_xx - sum_x ** 2
+    spread_y = n * sum_yy - sum_y ** 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        numerator = n * sum_xy - sum_x[:, None] * sum_y
+        r = numerator / np.sqrt(spread_x[:, None] * spread_y)
+    # Resamples without spread in x or y have no correlation; rounding can leave
+    # a tiny nonzero spread, so each is compared with the terms it came from
+    flat = (spread_x <= 1e-9 * n * sum_xx)[:, None] | (spread_y <= 1e-9 * n * sum_yy)
+    r[flat] = np.nan
+    return r
+
+
+def _exceedances(resampled: np.ndarray, observed: np.ndarray) -> np.ndarray:
+    # Small tolerance so shuffles that reproduce the observed |r| count as reaching it
+    return np.sum(np.abs(resampled) >= np.abs(observed)[None, :] - 1e-12, axis=0)
@@ -0,0 +1,150 @@
+import cProfile
+import datetime
+import io
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict
+
+import numpy as np
+
+
+def run_report_path(csv_path: str, run_name: str) -> str:
+    """Where the JSON run report of run_name goes: next to its results CSV."""
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), f'{run_name}_run_report.json')
+
+
+class RunInstrumentation:
+    """
+    Lightweight instrumentation for one experiment run.
+
+    - stage(name): context manager adding wall time to a named stage
+    - count(name, value) / add_counters(dict): integer counters (Collatz steps,
+      escape iterations, max_iter hits, ...)
+    - add_worker_stats(params, stats): per-parameter-set stage seconds and
+      counters sent back by sweep workers. Their stage times are CPU time summed
+      over workers, so they are reported apart from the main-process stages,
+      together with the slowest ("hot") parameter sets.
+
+    Used as a context manager around the whole run. profile=True runs cProfile
+    and trace_memory=True runs tracemalloc for that span; both only see the
+    main process (run sweeps with workers=1 to profile the Collatz kernels).
+    """
+
+    def __init__(self, name: str, profile: bool = False, trace_memory: bool = False, top_n: int = 20):
+        self.name = name
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.top_n = top_n
+        self.stages = {}
+        self.worker_stages = {}
+        self.counters = {}
+        self.parameter_sets = []
+        self.metadata = {}
+        self._profiler = None
+        self._memory = None
+        self._started_at = None
+        self._start = None
+        self._total_seconds = None
+
+    def __enter__(self):
+        self._started_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        if self.trace_memory:
+            tracemalloc.start()
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._total_seconds = time.perf_counter() - self._start
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self.trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:self.top_n]
+            tracemalloc.stop()
+            self._memory = {
+                'current_bytes': current,
+                'peak_bytes': peak,
+                'top_allocations': [{'location': str(stat.traceback), 'bytes': stat.size, 'count': stat.count}
+                                    for stat in top],
+            }
+        return False
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add_stage(self.stages, name, time.perf_counter() - start)
+
+    def count(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + int(value)
+
+    def add_counters(self, counters: Dict):
+        for name, value in counters.items():
+            self.count(name, value)
+
+    def record_escape_times(self, counts, max_iter: int):
+        """Counters for one batch of escape times: points, total iterations, max_iter hits."""
+        counts = np.asarray(counts)
+        self.count('escape_points', counts.size)
+        self.count('escape_iterations', counts.sum())
+        self.count('escape_max_iter_hits', (counts >= max_iter).sum())
+
+    def add_worker_stats(self, params, stats: Dict):
+        """Folds in the stats of one evaluated parameter set (see evaluate_parameter_set)."""
+        for stage, seconds in stats['stage_seconds'].items():
+            self._add_stage(self.worker_stages, stage, seconds)
+        self.add_counters(stats['counters'])
+        self.parameter_sets.append({
+            'params': list(params),
+            'seconds': sum(stats['stage_seconds'].values()),
+            'collatz_steps': stats['counters'].get('collatz_steps', 0),
+        })
+
+    @staticmethod
+    def _add_stage(stages, name, seconds):
+        entry = stages.setdefault(name, {'seconds': 0.0, 'calls': 0})
+        entry['seconds'] += seconds
+        entry['calls'] += 1
+
+    def report(self) -> Dict:
+        """The run report as a JSON-serializable dict."""
+        report = {
+            'run': self.name,
+            'started_at': self._started_at,
+            'total_seconds': self._total_seconds,
+            'metadata': self.metadata,
+            'stages': self.stages,
+            'worker_stages': self.worker_stages,
+            'counters': self.counters,
+            'hot_parameter_sets': sorted(self.parameter_sets, key=lambda p: p['seconds'], reverse=True)[:self.top_n],
+        }
+        if self._profiler is not None:
+            stream = io.StringIO()
+            pstats.Stats(self._profiler, stream=stream).sort_stats('cumulative').print_stats(self.top_n)
+            report['profile'] = stream.getvalue()
+        if self._memory is not None:
+            report['memory'] = self._memory
+        return report
+
+    def write_report(self, path: str) -> str:
+        """Writes report() as JSON to path and returns the path."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2, default=_json_default)
+        return path
+
+
+def _json_default(value):
+    # NumPy scalars that end up in metadata or counters
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,130 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+
+import numpy as np
+from scipy import ndimage
+
+from .mandelbrot_utils import escape_time_array
+
+# Grid points (parameters x resolution^2) iterated together per chunk
+DEFAULT_JULIA_CHUNK_ELEMENTS = 1 << 20
+
+# Pixels of one grid are 8-connected; pixels of different parameters never are
+_GRID_STRUCTURE = np.zeros((3, 3, 3), dtype=bool)
+_GRID_STRUCTURE[1] = True
+
+
+def julia_grid_axis(resolution: int, extent: float = 2.0) -> np.ndarray:
+    """Pixel coordinates along each axis of the square [-extent, extent]^2 grid."""
+    return np.linspace(-extent, extent, resolution)
+
+
+def filled_julia_escape_times(c, resolution: int = 64, extent: float = 2.0, max_iter: int = 100,
+                              bailout: float = 2.0) -> np.ndarray:
+    """
+    Escape-time grids of the filled Julia sets of z -> z*z + c for a batch of c.
+
+    All grids are stacked into one (len(c), resolution, resolution) array and
+    iterated together. As in escape_time_array only points that are still
+    bounded are iterated (active-index list over the whole stack), and the
+    count is the number of updates done when |z| first exceeds the escape
+    radius (check-first). The radius is max(bailout, |c|): beyond it every
+    orbit escapes, so points at max_iter are (numerically) in the filled set.
+    Row i / column j is the pixel z0 = x[j] + x[i]*1j with x = julia_grid_axis.
+    Non-finite c never iterate and are all max_iter.
+    """
+    c = np.asarray(c, dtype=np.complex128).ravel()
+    axis = julia_grid_axis(resolution, extent)
+    pixels = (axis[np.newaxis, :] + (axis * 1j)[:, np.newaxis]).ravel()
+    per_grid = pixels.size
+    counts = np.full(c.size * per_grid, max_iter, dtype=np.int64)
+
+    finite = np.flatnonzero(np.isfinite(c))
+    active = (finite[:, np.newaxis] * per_grid + np.arange(per_grid)).ravel()
+    z = np.tile(pixels, finite.size)
+    c_active = np.repeat(c[finite], per_grid)
+    radius_sq = np.maximum(bailout, np.abs(c_active)) ** 2
+
+    for i in range(max_iter):
+        if not active.size:
+            break
+        escaped = (z * np.conj(z)).real > radius_sq
+        if escaped.any():
+            counts[active[escaped]] = i
+            keep = ~escaped
+            active, z, c_active, radius_sq = active[keep], z[keep], c_active[keep], radius_sq[keep]
+        z = z * z + c_active
+
+    return counts.reshape(c.size, resolution, resolution)
+
+
+def julia_metrics(c, resolution: int = 64, extent: float = 2.0, max_iter: int = 100, bailout: float = 2.0,
+                  workers: Optional[int] = 1,
+                  chunk_elements: int = DEFAULT_JULIA_CHUNK_ELEMENTS) -> Dict[str, np.ndarray]:
+    """
+    Filled-Julia-set metrics for every parameter c (any shape), from the
+    escape-time grids of filled_julia_escape_times:
+    - 'interior_fraction': share of grid points that never escape
+    - 'mean_escape_time': mean escape time of the points that do escape (nan if none)
+    - 'components': 8-connected components of the filled set on the grid
+    - 'connected': the critical orbit (z0 = 0) stays bounded for max_iter
+      steps, i.e. c is in the Mandelbrot set, which holds exactly when the
+      Julia set is connected (components is the grid-level estimate of the same)
+
+    Parameters are split into chunks of about chunk_elements grid points and
+    spread over workers processes (None = one per CPU). Non-finite c (masked
+    mappings) get nan fractions, 0 components and connected=False.
+    Every array is shaped like c.
+    """
+    c = np.asarray(c, dtype=np.complex128)
+    flat = c.ravel()
+    step = max(1, chunk_elements // (resolution * resolution))
+    work_units = [(flat[i:i + step], resolution, extent, max_iter, bailout) for i in range(0, flat.size, step)]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(work_units) <= 1:
+        chunk_results = list(map(_julia_chunk, work_units))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunk_results = list(executor.map(_julia_chunk, work_units))
+
+    metrics = {
+        'interior_fraction': np.empty(0, dtype=np.float64),
+        'mean_escape_time': np.empty(0, dtype=np.float64),
+        'components': np.empty(0, dtype=np.int64),
+        'connected': np.empty(0, dtype=bool),
+    }
+    for name in metrics:
+        metrics[name] = np.concatenate([metrics[name]] + [result[name] for result in chunk_results])
+        metrics[name] = metrics[name].reshape(c.shape)
+    return metrics
+
+
+def _julia_chunk(work_unit) -> Dict[str, np.ndarray]:
+    """Worker entry point: metrics of one chunk of parameters."""
+    c, resolution, extent, max_iter, bailout = work_unit
+    counts = filled_julia_escape_times(c, resolution, extent, max_iter, bailout)
+    finite = np.isfinite(c)
+    filled = counts == max_iter
+    filled[~finite] = False
+
+    per_grid = resolution * resolution
+    interior = filled.reshape(c.size, -1).sum(axis=1)
+    escape_sum = np.where(filled, 0, counts).reshape(c.size, -1).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_escape_time = escape_sum / (per_grid - interior)
+
+    # Labels run in raster order and never span two grids, so each grid owns
+    # the labels between the previous grids' largest label and its own
+    labels, _ = ndimage.label(filled, structure=_GRID_STRUCTURE)
+    last_label = np.maximum.accumulate(labels.reshape(c.size, -1).max(axis=1))
+    components = np.diff(last_label, prepend=0)
+
+    critical = escape_time_array(c, max_iter, bailout=2.0, convention='check_first')
+    return {
+        'interior_fraction': np.where(finite, interior / per_grid, np.nan),
+        'mean_escape_time': np.where(finite, mean_escape_time, np.nan),
+        'components': components.astype(np.int64),
+        'connected': finite & (critical == max_iter),
+    }
@@ -1,15 +1,258 @@
-def mandelbrot_escape_time(c: complex, max_iter: int = 1000) -> int:
+import numpy as np
+from typing import Optional
+
+# Counting conventions for mandelbrot_escape_time / escape_time_array:
+# - 'check_first':  test |z| before each update (the default).
+#                   Returns the number of updates done when |z| first exceeds the bailout.
+# - 'update_first': update, then test (the original counting of experiment_02
+#                   and appendix_machine). Returns one less than 'check_first'
+#                   for points that escape before max_iter.
+ESCAPE_CONVENTIONS = ('check_first', 'update_first')
+
+
+def in_main_cardioid_or_bulb(c):
+    """
+    Closed-form test for the two largest interior components: the main cardioid
+    and the period-2 bulb centred at -1. Points passing it never escape, so
+    escape-time loops can return max_iter for them without iterating.
+    Works on a complex scalar (returns bool) or an array (returns a bool array).
+    """
+    x, y = np.real(c), np.imag(c)
+    q = (x - 0.25) ** 2 + y * y
+    return (q * (q + (x - 0.25)) <= 0.25 * y * y) | ((x + 1.0) ** 2 + y * y <= 0.0625)
+
+def mandelbrot_escape_time(c: complex, max_iter: int = 1000, interior_check: bool = True,
+                           periodicity_tol: Optional[float] = None, bailout: float = 2.0,
+                           convention: str = 'check_first') -> int:
     """
     Calculates the number of iterations before a complex number c escapes 
-    the radius of 2 under the iteration z = z*z + c, or max_iter if bounded.
+    the radius of 2 (bailout) under the iteration z = z*z + c, or max_iter if bounded.
+
+    interior_check: return max_iter at once for points in the main cardioid or
+    period-2 bulb (provably bounded, so the result is unchanged).
+    periodicity_tol: if set, also return max_iter once the orbit comes back
+    within this distance of an earlier saved point (numerically periodic).
+    Off by default because points near repelling cycles could be cut short.
+    convention: see ESCAPE_CONVENTIONS.
     """
+    if convention not in ESCAPE_CONVENTIONS:
+        raise ValueError(f"Unknown convention '{convention}'. Use one of {ESCAPE_CONVENTIONS}.")
+    if interior_check and in_main_cardioid_or_bulb(c):
+        return max_iter
+
     z = 0 + 0j
+    saved = z
+    next_save = 8
     for i in range(max_iter):
-        if abs(z) > 2.0:
+        if convention == 'update_first':
+            z = z*z + c
+        if abs(z) > bailout:
             return i
-        z = z*z + c
+        if convention == 'check_first':
+            z = z*z + c
+        if periodicity_tol is not None:
+            if abs(z - saved) <= periodicity_tol:
+                return max_iter
+            if i == next_save:
+                # Brent-style: compare against points saved at doubling intervals
+                saved = z
+                next_save *= 2
     return max_iter
 
-def is_in_mandelbrot_set(c: complex, threshold: int = 1000) -> bool:
+def is_in_mandelbrot_set(c: complex, threshold: int = 1000, interior_check: bool = True,
+                         periodicity_tol: Optional[float] = None) -> bool:
     """True if c is in the Mandelbrot set (i.e., remains bounded)."""
-    return mandelbrot_escape_time(c, threshold) == threshold
+    return mandelbrot_escape_time(c, threshold, interior_check, periodicity_tol) == threshold
+
+
+
+
+def escape_time_array(c, max_iter: int = 1000, bailout: float = 2.0, convention: str = 'check_first',
+                      interior_check: bool = True, periodicity_tol: Optional[float] = None) -> np.ndarray:
+    """
+    Vectorized escape time for an array of complex points (any shape).
+
+    Only points that are still bounded are iterated: after each step the
+    escaped ones are dropped from an active-index list, so the cost follows
+    the number of live points rather than the grid size. Points that never
+    escape (including nan inputs) get max_iter. Returns an int array shaped like c.
+
+    interior_check and periodicity_tol work as in mandelbrot_escape_time and
+    drop provably / numerically bounded points early with max_iter.
+    """
+    if convention not in ESCAPE_CONVENTIONS:
+        raise ValueError(f"Unknown convention '{convention}'. Use one of {ESCAPE_CONVENTIONS}.")
+
+    c = np.asarray(c, dtype=np.complex128)
+    c_flat = c.ravel()
+    counts = np.full(c_flat.size, max_iter, dtype=np.int64)
+
+    if interior_check:
+        active = np.flatnonzero(~in_main_cardioid_or_bulb(c_flat))
+    else:
+        active = np.arange(c_flat.size)
+    c_active = c_flat[active]
+    z = np.zeros_like(c_active)
+    saved = z.copy()
+    next_save = 8
+
+    for i in range(max_iter):
+        if not active.size:
+            break
+        if convention == 'update_first':
+            z = z * z + c_active
+        escaped = np.abs(z) > bailout
+        if escaped.any():
+            counts[active[escaped]] = i
+            keep = ~escaped
+            active, z, c_active, saved = active[keep], z[keep], c_active[keep], saved[keep]
+        if convention == 'check_first':
+            z = z * z + c_active
+
+        if periodicity_tol is not None:
+            # Orbit came back to a saved point: numerically periodic, keep max_iter
+            periodic = np.abs(z - saved) <= periodicity_tol
+            if periodic.any():
+                keep = ~periodic
+                active, z, c_active, saved = active[keep], z[keep], c_active[keep], saved[keep]
+            if i == next_save:
+                saved = z.copy()
+                next_save *= 2
+
+    return counts.reshape(c.shape)
+
+
+def _grid_axis(start: float, stop: float, num: int, first: int, last: int) -> np.ndarray:
+    """Points first..last-1 of np.ogrid[start:stop:num*1j], computed the same way ogrid does."""
+    step = (stop - start) / float(num - 1) if num != 1 else 1
+    return np.arange(first, last, dtype=float) * step + start
+
+
+def _background_counts(c: np.ndarray, max_iter: int, bailout: float, fill: int) -> np.ndarray:
+    """Background escape counts for a flat array of points (see mandelbrot_background_grid)."""
+    div_time = np.full(c.size, fill, dtype=np.int64)
+    active = np.arange(c.size)
+    z = c.copy()
+    c_active = c
+    limit = bailout * bailout
+
+    for i in range(max_iter):
+        if not active.size:
+            break
+        z = z**2 + c_active
+        diverge = (z * np.conj(z)).real > limit
+        if diverge.any():
+            div_time[active[diverge]] = i
+            keep = ~diverge
+            active, z, c_active = active[keep], z[keep], c_active[keep]
+
+    return div_time
+
+
+BACKGROUND_METHODS = ('brute_force', 'mariani_silver')
+
+
+def mandelbrot_background_grid(extent=(-2.5, 1.5, -1.5, 1.5), resolution=(400, 400), max_iter: int = 50,
+                               bailout: float = 2.0, interior_value: Optional[int] = None,
+                               rows: Optional[tuple] = None, cols: Optional[tuple] = None,
+                               method: str = 'brute_force') -> np.ndarray:
+    """
+    Escape-count grid used as the background of the overlay plots.
+
+    Same recipe as the original plotting loop: z starts at c, each step is
+    z**2 + c and a pixel's count is the step index at which |z|^2 first
+    exceeds bailout^2. Row 0 is ymin (np.ogrid order). Only pixels that have
+    not escaped are iterated, so escaped ones are no longer squared and reset.
+
+    extent is (xmin, xmax, ymin, ymax), resolution is (height, width).
+    Pixels that never escape get interior_value (max_iter if None; the old
+    plotting loop used the grid height).
+    rows / cols: optional (first, last) pixel ranges to compute only one tile
+    of the full grid; tile pixels are identical to the same pixels of the full grid.
+    method: 'brute_force' iterates every pixel; 'mariani_silver' uses
+    mariani_silver_fill (same output, far fewer iterations in uniform regions).
+    """
+    if method not in BACKGROUND_METHODS:
+        raise ValueError(f"Unknown method '{method}'. Use one of {BACKGROUND_METHODS}.")
+
+    xmin, xmax, ymin, ymax = extent
+    h, w = resolution
+    rows = rows if rows is not None else (0, h)
+    cols = cols if cols is not None else (0, w)
+    y = _grid_axis(ymin, ymax, h, *rows)
+    x = _grid_axis(xmin, xmax, w, *cols)
+    fill = max_iter if interior_value is None else interior_value
+
+    if method == 'mariani_silver':
+        return mariani_silver_fill(x, y, max_iter, bailout, fill)
+
+    c = (x[np.newaxis, :] + (y*1j)[:, np.newaxis]).ravel()
+    return _background_counts(c, max_iter, bailout, fill).reshape(len(y), len(x))
+
+
+def mariani_silver_fill(x: np.ndarray, y: np.ndarray, max_iter: int, bailout: float, fill: int,
+                        min_size: int = 8) -> np.ndarray:
+    """
+    Mariani-Silver rendering of the background grid over axes x (columns) and y (rows).
+
+    Each rectangle's border is computed first. If every border pixel has the
+    same count the interior is filled with it without iterating; otherwise the
+    rectangle is split in four and the quarters share the split lines. Points
+    escaping later than a given count form one connected region containing the
+    whole set, so a uniform border can only hide other counts when it encloses
+    the set; rectangles containing c = 0 are therefore never filled. Borders
+    that never escape are only filled when the whole interior passes the
+    closed-form cardioid / period-2 bulb test. Rectangles at most min_size
+    pixels across are computed directly. All rectangles of one subdivision
+    level are handled together, so each level is one vectorized kernel call.
+    """
+    h, w = len(y), len(x)
+    out = np.full((h, w), -1, dtype=np.int64)
+
+    def compute(r_idx, c_idx):
+        # Same arithmetic as the full-grid path: x + y*1j per pixel
+        unknown = out[r_idx, c_idx] < 0
+        r_idx, c_idx = r_idx[unknown], c_idx[unknown]
+        if r_idx.size:
+            out[r_idx, c_idx] = _background_counts(x[c_idx] + y[r_idx]*1j, max_iter, bailout, fill)
+
+    # Rectangles are inclusive pixel bounds (r0, r1, c0, c1)
+    level = [(0, h - 1, 0, w - 1)] if h and w else []
+    while level:
+        border_r, border_c = [], []
+        for r0, r1, c0, c1 in level:
+            cols_span = np.arange(c0, c1 + 1)
+            rows_span = np.arange(r0, r1 + 1)
+            border_r += [np.full(cols_span.size, r0), np.full(cols_span.size, r1), rows_span, rows_span]
+            border_c += [cols_span, cols_span, np.full(rows_span.size, c0), np.full(rows_span.size, c1)]
+        compute(np.concatenate(border_r), np.concatenate(border_c))
+
+        next_level, direct_r, direct_c = [], [], []
+        for r0, r1, c0, c1 in level:
+            if r1 - r0 < 2 or c1 - c0 < 2:
+                continue  # no interior pixels left
+            border = np.concatenate((out[r0, c0:c1 + 1], out[r1, c0:c1 + 1],
+                                     out[r0:r1 + 1, c0], out[r0:r1 + 1, c1]))
+            # A uniform border can only hide other counts if it surrounds the whole
+            # set, so rectangles around c = 0 are always split
+            around_origin = min(x[c0], x[c1]) <= 0 <= max(x[c0], x[c1]) and min(y[r0], y[r1]) <= 0 <= max(y[r0], y[r1])
+            uniform = not around_origin and (border == border[0]).all()
+            if uniform and border[0] == fill:
+                # Never-escaping fills are only trusted where they are provably bounded;
+                # numerically, isolated pixels near the boundary can still escape
+                interior_c = x[np.newaxis, c0 + 1:c1] + (y[r0 + 1:r1]*1j)[:, np.newaxis]
+                uniform = bool(in_main_cardioid_or_bulb(interior_c).all())
+            if uniform:
+                out[r0 + 1:r1, c0 + 1:c1] = border[0]
+            elif r1 - r0 <= min_size or c1 - c0 <= min_size:
+                rr, cc = np.mgrid[r0 + 1:r1, c0 + 1:c1]
+                direct_r.append(rr.ravel())
+                direct_c.append(cc.ravel())
+            else:
+                rm, cm = (r0 + r1) // 2, (c0 + c1) // 2
+                next_level += [(r0, rm, c0, cm), (r0, rm, cm, c1), (rm, r1, c0, cm), (rm, r1, cm, c1)]
+        if direct_r:
+            compute(np.concatenate(direct_r), np.concatenate(direct_c))
+        level = next_level
+
+    return out
@@ -1,62 +1,144 @@
 import numpy as np # Ensure this line is present at the top
-def map_params_to_complex_v1(a: int, b: int, c: int) -> complex:
+
+# --- MAPPING REGISTRY ---
+# name -> {'label': printable hypothesis name, 'func': mapping, 'study': bool}.
+# The name is also the suffix of the result columns (z_<name>, escape_<name>).
+# Mappings with study=True are the hypotheses compared by experiment_02.
+MAPPING_REGISTRY = {}
+
+
+def register_mapping(name: str, label: str, study: bool = True):
+    """Decorator that adds a mapping function to MAPPING_REGISTRY under name."""
+    def decorator(func):
+        MAPPING_REGISTRY[name] = {'label': label, 'func': func, 'study': study}
+        return func
+    return decorator
+
+
+def study_mappings():
+    """Registry entries that take part in the comparative study (study=True)."""
+    return {name: entry for name, entry in MAPPING_REGISTRY.items() if entry['study']}
+
+
+def get_mapping(name: str):
+    """Mapping function registered under name."""
+    if name not in MAPPING_REGISTRY:
+        raise KeyError(f"Unknown mapping '{name}'. Registered: {sorted(MAPPING_REGISTRY)}")
+    return MAPPING_REGISTRY[name]['func']
+
+
+def _as_float_arrays(a, b, c):
+    """Broadcasts a, b, c to float64 arrays; also reports whether all three were scalars."""
+    scalar = np.ndim(a) == 0 and np.ndim(b) == 0 and np.ndim(c) == 0
+    a, b, c = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float), np.asarray(c, dtype=float))
+    return scalar, a, b, c
+
+
+def _to_complex(real_part, imag_part, valid, scalar):
+    """Builds the complex result, with nan+nanj wherever the inputs were invalid."""
+    z = np.where(valid, real_part + 1j * imag_part, complex(np.nan, np.nan))
+    return complex(z) if scalar else z
+
+
+# Every mapping below accepts scalars or NumPy arrays (any broadcastable mix) for
+# a, b, c. Scalars give a Python complex, arrays a complex128 array. Inputs the
+# formula is undefined for (zero divisors, log of non-positive ratios) give
+# nan+nanj instead of raising.
+
+@register_mapping('v1', 'A (V1 Control)')
+def map_params_to_complex_v1(a, b, c):
     """
     Mapping Function V1: c_complex = (b/a) + (c/a)*i
-    
+
     - Real axis represents the Multiplier/Divisor ratio (B/A).
     - Imaginary axis represents the Adder/Divisor ratio (C/A).
+    - a = 0 is masked to nan+nanj.
     """
-    if a == 0:
-        raise ValueError("Divisor 'a' cannot be zero for mapping.")
-        
-    real_part = b / a
-    imaginary_part = c / a
-    
-    return complex(real_part, imaginary_part)
+    scalar, a, b, c = _as_float_arrays(a, b, c)
+    valid = a != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        real_part = b / a
+        imaginary_part = c / a
+
+    return _to_complex(real_part, imaginary_part, valid, scalar)
 
 
 # --- HYPOTHESIS B: LOGARITHMIC MAPPING (The Scaling Correction) ---
-def map_params_logarithmic(a: int, b: int, c: int) -> complex:
+@register_mapping('log', 'B (Logarithmic)')
+def map_params_logarithmic(a, b, c):
     """
-    Hypothesis B: Logarithmically scales the Collatz growth ratios (b/a, c/a) 
+    Hypothesis B: Logarithmically scales the Collatz growth ratios (b/a, c/a)
     and centers the data near the critical Mandelbrot boundary (c=-1).
+    Non-positive ratios (and a = 0) are masked to nan+nanj.
     """
-    # Real part: ln(b/a), shifted by -1.0
-    real_part = np.log(b / a) - 1.0 
-    
-    # Imaginary part: ln(c/a), shifted by -1.0
-    imag_part = np.log(c / a) - 1.0
-    
-    return complex(real_part, imag_part)
+    scalar, a, b, c = _as_float_arrays(a, b, c)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        b_ratio = b / a
+        c_ratio = c / a
+        valid = (a != 0) & (b_ratio > 0) & (c_ratio > 0)
+
+        # Real part: ln(b/a), shifted by -1.0
+        real_part = np.log(b_ratio) - 1.0
+
+        # Imaginary part: ln(c/a), shifted by -1.0
+        imag_part = np.log(c_ratio) - 1.0
+
+    return _to_complex(real_part, imag_part, valid, scalar)
+
 # --- HYPOTHESIS C: TRIGONOMETRIC/POLAR MAPPING ---
-def map_params_polar(a: int, b: int, c: int) -> complex:
+@register_mapping('polar', 'C (Polar/Trigonometric)')
+def map_params_polar(a, b, c):
     """
     Hypothesis C: Maps parameters to a complex number using Polar Coordinates,
     where magnitude (r) is the sum/divisor and the angle (theta) is based on the ratio.
+    a = 0 or b = 0 is masked to nan+nanj.
     """
-    # 1. Calculate Polar Components
-    r = (b + c) / a
-    
-    # Calculate angle (theta) based on c/b ratio. Using arctan2 is safer against division by zero.
-    # We use abs(c/b) to keep the angle in the first quadrant for consistency.
-    theta = np.arctan(c / b) 
-    
-    # 2. Convert to Cartesian Coordinates (x + iy)
-    real_part = r * np.cos(theta)
-    imag_part = r * np.sin(theta)
-    
-    return complex(real_part, imag_part)
+    scalar, a, b, c = _as_float_arrays(a, b, c)
+    valid = (a != 0) & (b != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # 1. Calculate Polar Components
+        r = (b + c) / a
+
+        # Calculate angle (theta) based on c/b ratio.
+        theta = np.arctan(c / b)
+
+        # 2. Convert to Cartesian Coordinates (x + iy)
+        real_part = r * np.cos(theta)
+        imag_part = r * np.sin(theta)
+
+    return _to_complex(real_part, imag_part, valid, scalar)
 
 # --- HYPOTHESIS D: RECIPROCAL PRODUCTS MAPPING (The Inverse Stability Test) ---
-def map_params_reciprocal_products(a: int, b: int, c: int) -> complex:
+@register_mapping('reciprocal', 'D (Reciprocal Products)')
+def map_params_reciprocal_products(a, b, c):
     """
     Hypothesis D: Reciprocal of Paired Products.
     Tests inverse stability: Real = 1/(a*b), Imaginary = 1/(a*c).
+    Zero products are masked to nan+nanj.
     """
-    # Real part: Inverse of the multiplier product
-    real_part = 1.0 / (a * b)
-    
-    # Imaginary part: Inverse of the offset product
-    imag_part = 1.0 / (a * c)
-    
-    return complex(real_part, imag_part)
\ No newline at end of file
+    scalar, a, b, c = _as_float_arrays(a, b, c)
+    valid = (a * b != 0) & (a * c != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Real part: Inverse of the multiplier product
+        real_part = 1.0 / (a * b)
+
+        # Imaginary part: Inverse of the offset product
+        imag_part = 1.0 / (a * c)
+
+    return _to_complex(real_part, imag_part, valid, scalar)
+
+
+# --- HYPOTHESIS D (APPENDIX VARIANT) ---
+@register_mapping('reciprocal_appendix', 'D (Reciprocal Products, appendix variant)', study=False)
+def map_params_reciprocal_appendix(a, b, c):
+    """
+    Variant of Hypothesis D used for the appendix figures: Real = 1/b, Imaginary = 1/(a*c).
+    Zero b or a*c is masked to nan+nanj.
+    """
+    scalar, a, b, c = _as_float_arrays(a, b, c)
+    valid = (b != 0) & (a * c != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        real_part = 1 / b
+        imag_part = 1 / (a * c)
+
+    return _to_complex(real_part, imag_part, valid, scalar)
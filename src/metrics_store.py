@@ -0,0 +1,78 @@
+import os
+import sqlite3
+from typing import Dict, Optional
+
+# Bump this whenever a change to the Collatz solvers or measure_collatz_behavior
+# could change the metrics; rows stored under an older version are ignored.
+METRICS_CODE_VERSION = 1
+
+DEFAULT_STORE_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', 'data', 'cache', 'collatz_metrics.sqlite'))
+
+_METRIC_COLUMNS = ('convergence_rate', 'divergence_rate', 'cycle_rate', 'avg_steps_to_one')
+
+
+class MetricsStore:
+    """
+    Persistent SQLite cache of measure_collatz_behavior results.
+
+    Keyed by (a, b, c, test_range, max_iterations, code version). The database
+    runs in WAL mode with a busy timeout, so several sweep processes can read
+    and write the same file at once; each process should open its own store.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, timeout: float = 60.0):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=timeout)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS collatz_metrics ('
+            ' a INTEGER, b INTEGER, c INTEGER,'
+            ' range_start INTEGER, range_end INTEGER, max_iterations INTEGER,'
+            ' code_version INTEGER,'
+            ' convergence_rate REAL, divergence_rate REAL, cycle_rate REAL, avg_steps_to_one REAL,'
+            ' PRIMARY KEY (a, b, c, range_start, range_end, max_iterations, code_version))'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(a, b, c, test_range, max_iterations):
+        return (int(a), int(b), int(c), int(test_range[0]), int(test_range[1]),
+                int(max_iterations), METRICS_CODE_VERSION)
+
+    def get(self, a, b, c, test_range, max_iterations) -> Optional[Dict]:
+        """Stored metrics dict for this key, or None if it has not been computed yet."""
+        row = self._conn.execute(
+            'SELECT convergence_rate, divergence_rate, cycle_rate, avg_steps_to_one'
+            ' FROM collatz_metrics WHERE a=? AND b=? AND c=? AND range_start=? AND range_end=?'
+            ' AND max_iterations=? AND code_version=?',
+            self._key(a, b, c, test_range, max_iterations),
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(_METRIC_COLUMNS, row))
+
+    def put(self, a, b, c, test_range, max_iterations, metrics: Dict):
+        """Stores one metrics dict (replaces any row with the same key)."""
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO collatz_metrics VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                self._key(a, b, c, test_range, max_iterations)
+                + tuple(float(metrics[col]) for col in _METRIC_COLUMNS),
+            )
+
+    def prune_stale(self) -> int:
+        """Deletes rows written by older code versions. Returns how many were removed."""
+        with self._conn:
+            cursor = self._conn.execute(
+                'DELETE FROM collatz_metrics WHERE code_version != ?', (METRICS_CODE_VERSION,))
+        return cursor.rowcount
+
+    def __len__(self):
+        return self._conn.execute(
+            'SELECT COUNT(*) FROM collatz_metrics WHERE code_version=?', (METRICS_CODE_VERSION,)
+        ).fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,194 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .collatz_metrics import measure_collatz_behavior
+from .mandelbrot_utils import is_in_mandelbrot_set, mandelbrot_escape_time
+from .mapping_functions import map_params_to_complex_v1
+from .metrics_store import MetricsStore
+
+# Columns of one evaluate_parameter_set row and their dtypes
+RESULT_DTYPES = {
+    'a_divisor': 'int64', 'b_multiplier': 'int64', 'c_adder': 'int64',
+    'collatz_conv_rate': 'float64', 'avg_steps': 'float64',
+    'complex_real': 'float64', 'complex_imag': 'float64',
+    'in_mandelbrot': 'bool', 'escape_time': 'int64',
+}
+
+# Same restricted ranges as the original Experiment 01 sampler (inclusive bounds)
+DEFAULT_A_RANGE = (2, 10)   # Divisor
+DEFAULT_B_RANGE = (1, 10)   # Multiplier
+DEFAULT_C_RANGE = (1, 10)   # Adder
+
+
+def evaluate_parameter_set(a: int, b: int, c: int, test_range=(1, 50),
+                           max_iterations: int = 1000000, engine: str = 'python',
+                           store: Optional[MetricsStore] = None, stats: Optional[Dict] = None) -> Dict:
+    """
+    Full Experiment 01 pipeline for one (a, b, c): Collatz metrics, V1 mapping
+    and Mandelbrot status. Returns one results row (same columns as experiment_01).
+    store, if given, is checked before (and updated after) simulating.
+    stats, if given, is filled with 'stage_seconds' (collatz, mapping,
+    escape_time) and 'counters' (see measure_collatz_behavior) for this set.
+    """
+    counters = {}
+    start = time.perf_counter()
+    col_metrics = measure_collatz_behavior(a, b, c, test_range=test_range, max_iterations=max_iterations,
+                                           engine=engine, store=store, counters=counters)
+    collatz_done = time.perf_counter()
+    z_point = map_params_to_complex_v1(a, b, c)
+    mapping_done = time.perf_counter()
+    in_mandelbrot = is_in_mandelbrot_set(z_point)
+    escape_time = mandelbrot_escape_time(z_point)
+    escape_done = time.perf_counter()
+
+    if stats is not None:
+        counters['escape_points'] = 1
+        counters['escape_iterations'] = escape_time
+        counters['escape_max_iter_hits'] = int(in_mandelbrot)
+        stats['stage_seconds'] = {
+            'collatz': collatz_done - start,
+            'mapping': mapping_done - collatz_done,
+            'escape_time': escape_done - mapping_done,
+        }
+        stats['counters'] = counters
+
+    return {
+        'a_divisor': a,
+        'b_multiplier': b,
+        'c_adder': c,
+        'collatz_conv_rate': col_metrics['convergence_rate'],
+        'avg_steps': col_metrics['avg_steps_to_one'],
+        'complex_real': z_point.real,
+        'complex_imag': z_point.imag,
+        'in_mandelbrot': in_mandelbrot,
+        'escape_time': escape_time,
+    }
+
+
+def grid_parameters(a_range=DEFAULT_A_RANGE, b_range=DEFAULT_B_RANGE, c_range=DEFAULT_C_RANGE) -> List[tuple]:
+    """Every (a, b, c) triple in the inclusive ranges, in a fixed order."""
+    return list(itertools.product(
+        range(a_range[0], a_range[1] + 1),
+        range(b_range[0], b_range[1] + 1),
+        range(c_range[0], c_range[1] + 1),
+    ))
+
+
+def sample_parameters(num_samples: int, seed: int, chunk_size: int = 256,
+                      a_range=DEFAULT_A_RANGE, b_range=DEFAULT_B_RANGE, c_range=DEFAULT_C_RANGE) -> List[tuple]:
+    """
+    num_samples random (a, b, c) triples (repeats allowed, like the original sampler).
+
+    Each chunk of chunk_size samples draws from its own generator spawned from
+    seed, so the triples depend only on (seed, chunk_size) and not on how many
+    workers later evaluate them.
+    """
+    num_chunks = -(-num_samples // chunk_size)
+    chunk_seeds = np.random.SeedSequence(seed).spawn(num_chunks)
+    params = []
+    for chunk_index, chunk_seed in enumerate(chunk_seeds):
+        rng = np.random.default_rng(chunk_seed)
+        size = min(chunk_size, num_samples - chunk_index * chunk_size)
+        a = rng.integers(a_range[0], a_range[1] + 1, size=size)
+        b = rng.integers(b_range[0], b_range[1] + 1, size=size)
+        c = rng.integers(c_range[0], c_range[1] + 1, size=size)
+        params.extend(zip(a.tolist(), b.tolist(), c.tolist()))
+    return params
+
+
+def _evaluate_chunk(work_unit):
+    """Worker entry point: evaluates one chunk of parameter triples. Returns (rows, per-row stats)."""
+    params, test_range, max_iterations, engine, store_path = work_unit
+    # SQLite connections cannot cross processes, so each work unit opens its own
+    store = MetricsStore(store_path) if store_path is not None else None
+    rows, stats = [], []
+    try:
+        for a, b, c in params:
+            row_stats = {}
+            rows.append(evaluate_parameter_set(a, b, c, test_range, max_iterations, engine, store, row_stats))
+            stats.append(row_stats)
+        return rows, stats
+    finally:
+        if store is not None:
+            store.close()
+
+
+def run_parameter_sweep(params, test_range=(1, 50), max_iterations: int = 1000000,
+                        engine: str = 'python', workers: Optional[int] = None,
+                        chunk_size: int = 64, progress=None,
+                        store_path: Optional[str] = None, instrumentation=None,
+                        checkpoint=None, checkpoint_interval: float = 60.0) -> List[Dict]:
+    """
+    Evaluates every (a, b, c) in params across a process pool.
+
+    Repeated triples are evaluated once. The unique triples are split into
+    chunks of chunk_size; each chunk is one work unit for the pool. Rows come
+    back in the same order as params (one row per entry, repeats included).
+    workers=None uses every core, workers=1 runs in this process (no pool).
+    progress, if given, is called as progress(unique_done, unique_total) after each chunk.
+    store_path, if given, points every worker at a shared MetricsStore.
+    instrumentation, if given (a RunInstrumentation), receives every unique
+    triple's stage times and counters.
+    checkpoint, if given (a started SweepCheckpoint), supplies the rows of
+    triples finished by an earlier run, which are not evaluated again, and
+    receives new rows in batches at least every checkpoint_interval seconds
+    (and whatever is pending if the sweep is interrupted).
+    """
+    params = [tuple(int(v) for v in p) for p in params]
+    unique_params = list(dict.fromkeys(params))
+    rows_by_params = checkpoint.rows_by_params() if checkpoint is not None else {}
+    todo = [p for p in unique_params if p not in rows_by_params]
+    chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+    work_units = [(chunk, test_range, max_iterations, engine, store_path) for chunk in chunks]
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers <= 1 or len(work_units) <= 1:
+        _collect(map(_evaluate_chunk, work_units), chunks, rows_by_params, len(unique_params),
+                 progress, instrumentation, checkpoint, checkpoint_interval)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            _collect(executor.map(_evaluate_chunk, work_units), chunks, rows_by_params, len(unique_params),
+                     progress, instrumentation, checkpoint, checkpoint_interval)
+
+    return [dict(rows_by_params[p]) for p in params]
+
+
+def _collect(chunk_results, chunks, rows_by_params, total, progress, instrumentation,
+             checkpoint, checkpoint_interval):
+    """
+    Adds each chunk's rows to rows_by_params as it arrives, reporting progress
+    and feeding instrumentation; with a checkpoint, also flushes finished rows
+    to it at intervals.
+    """
+    pending = []
+    last_flush = time.monotonic()
+    try:
+        for chunk, (chunk_rows, chunk_stats) in zip(chunks, chunk_results):
+            rows_by_params.update(zip(chunk, chunk_rows))
+            if instrumentation is not None:
+                for p, row_stats in zip(chunk, chunk_stats):
+                    instrumentation.add_worker_stats(p, row_stats)
+            if progress is not None:
+                progress(len(rows_by_params), total)
+
+            if checkpoint is not None:
+                pending.extend(chunk_rows)
+                if time.monotonic() - last_flush >= checkpoint_interval:
+                    checkpoint.record(_rows_frame(pending))
+                    pending = []
+                    last_flush = time.monotonic()
+    finally:
+        if checkpoint is not None and pending:
+            checkpoint.record(_rows_frame(pending))
+
+
+def _rows_frame(rows: List[Dict]) -> pd.DataFrame:
+    return pd.DataFrame(rows, columns=list(RESULT_DTYPES)).astype(RESULT_DTYPES)
@@ -0,0 +1,304 @@
+import json
+import os
+import tempfile
+import uuid
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+def results_store_path(csv_path: str) -> str:
+    """Directory of the columnar store that belongs to a results CSV (same name, .columns)."""
+    return os.path.splitext(csv_path)[0] + '.columns'
+
+
+class ResultsStore:
+    """
+    Columnar results table on disk: one .npy file per column per part.
+
+    Layout of the store directory:
+    - schema.json: column dtypes and the list of parts with their row counts,
+      file names and per-column meta (the settings a column was computed with)
+    - one file per (part, column), or two for complex columns (.real / .imag,
+      both float64)
+
+    append() adds rows as a new part, so the existing data is never rewritten.
+    write_columns() / write_part_columns() add or replace columns (for all
+    parts or only some) without touching the others.
+    Reads load only the requested columns, each file through a memory map.
+    Every change writes its new files first and then swaps schema.json in one
+    os.replace, so readers see either the old table or the new one, never a mix.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._schema = self._load_schema()
+
+    # --- schema ---
+
+    @property
+    def _schema_path(self) -> str:
+        return os.path.join(self.path, 'schema.json')
+
+    def _load_schema(self) -> Dict:
+        if not os.path.exists(self._schema_path):
+            return {'columns': {}, 'parts': []}
+        with open(self._schema_path) as f:
+            return json.load(f)
+
+    def _commit(self, schema: Dict):
+        """Atomically replaces schema.json, then deletes files the new schema no longer uses."""
+        os.makedirs(self.path, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.json.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(schema, f, indent=1)
+        os.replace(tmp_path, self._schema_path)
+
+        old_files = self._files(self._schema)
+        self._schema = schema
+        for name in old_files - self._files(schema):
+            os.remove(os.path.join(self.path, name))
+
+    @staticmethod
+    def _files(schema: Dict) -> set:
+        return {name for part in schema['parts'] for files in part['files'].values() for name in files}
+
+    def exists(self) -> bool:
+        return os.path.exists(self._schema_path)
+
+    @property
+    def columns(self) -> Dict[str, str]:
+        """Column name -> stored dtype, in table order."""
+        return dict(self._schema['columns'])
+
+    def __len__(self):
+        return sum(part['rows'] for part in self._schema['parts'])
+
+    # --- writing ---
+
+    def _write_column(self, values: np.ndarray, dtype: str) -> List[str]:
+        token = uuid.uuid4().hex[:12]
+        if dtype == 'complex128':
+            halves = (('real', values.real), ('imag', values.imag))
+            names = [f'{token}.{suffix}.npy' for suffix, _ in halves]
+            arrays = [np.ascontiguousarray(half, dtype=np.float64) for _, half in halves]
+        else:
+            names = [f'{token}.npy']
+            arrays = [np.ascontiguousarray(values, dtype=dtype)]
+        os.makedirs(self.path, exist_ok=True)
+        for name, array in zip(names, arrays):
+            np.save(os.path.join(self.path, name), array)
+        return names
+
+    def overwrite(self, df: pd.DataFrame):
+        """Replaces the whole table with df (one part)."""
+        columns = {name: _stored_dtype(df[name]) for name in df.columns}
+        schema = {'columns': columns, 'parts': []}
+        self._commit(self._with_part(schema, df, columns))
+
+    def append(self, df: pd.DataFrame):
+        """
+        Adds the rows of df as a new part. Its columns must be a subset of the
+        table's (a new table takes df's columns); columns it lacks are missing
+        for these rows and read back as NaN (see read).
+        """
+        if not self._schema['parts']:
+            self.overwrite(df)
+            return
+        unknown = set(df.columns) - set(self._schema['columns'])
+        if unknown:
+            raise ValueError(f"Columns {sorted(unknown)} are not in the table; add them with write_columns first.")
+        columns = {name: self._schema['columns'][name] for name in df.columns}
+        self._commit(self._with_part(dict(self._schema), df, columns))
+
+    def _with_part(self, schema: Dict, df: pd.DataFrame, columns: Dict[str, str]) -> Dict:
+        files = {name: self._write_column(_column_values(df[name], dtype), dtype) for name, dtype in columns.items()}
+        return {**schema, 'parts': schema['parts'] + [{'rows': len(df), 'files': files, 'meta': {}}]}
+
+    def write_columns(self, data: Dict[str, np.ndarray], parts: Optional[List[int]] = None,
+                      meta: Optional[Dict[str, Dict]] = None):
+        """
+        Adds or replaces columns. Each value holds one entry per row of the
+        selected parts (all parts by default, in order). Other columns and
+        parts are left as they are. meta: see write_part_columns.
+        """
+        parts = list(range(self.num_parts)) if parts is None else list(parts)
+        updates = {i: {} for i in parts}
+        for name, values in data.items():
+            values = np.asarray(values)
+            expected_rows = sum(self._schema['parts'][i]['rows'] for i in parts)
+            if len(values) != expected_rows:
+                raise ValueError(f"Column '{name}' has {len(values)} values for {expected_rows} rows.")
+            offset = 0
+            for i in parts:
+                rows = self._schema['parts'][i]['rows']
+                updates[i][name] = values[offset:offset + rows]
+                offset += rows
+        self.write_part_columns(updates, meta)
+
+    def write_part_columns(self, updates: Dict[int, Dict[str, np.ndarray]], meta: Optional[Dict[str, Dict]] = None):
+        """
+        Adds or replaces column values part by part: updates maps a part index
+        to {column: values for that part's rows}. Everything is committed at
+        once. meta optionally maps a column to a JSON-serializable dict of the
+        settings that produced it; it is recorded for every part written here
+        (read it back with column_meta). Columns written without meta lose it.
+        """
+        meta = meta or {}
+        schema = {'columns': dict(self._schema['columns']),
+                  'parts': [dict(part, files=dict(part['files']), meta=dict(part.get('meta', {})))
+                            for part in self._schema['parts']]}
+
+        for i, columns in updates.items():
+            part = schema['parts'][i]
+            for name, values in columns.items():
+                values = np.asarray(values)
+                if len(values) != part['rows']:
+                    raise ValueError(f"Column '{name}' has {len(values)} values for the {part['rows']} rows of part {i}.")
+                dtype = schema['columns'].get(name) or _stored_dtype(pd.Series(values, name=name))
+                schema['columns'][name] = dtype
+                part['files'][name] = self._write_column(_column_values(pd.Series(values), dtype), dtype)
+                if name in meta:
+                    part['meta'][name] = meta[name]
+                else:
+                    part['meta'].pop(name, None)
+        self._commit(schema)
+
+    @property
+    def num_parts(self) -> int:
+        return len(self._schema['parts'])
+
+    def column_meta(self, part: int, name: str) -> Optional[Dict]:
+        """Settings recorded when column name of this part was last written (None if none or missing)."""
+        part = self._schema['parts'][part]
+        if name not in part['files']:
+            return None
+        return part.get('meta', {}).get(name)
+
+    def compact(self):
+        """Merges all parts into one (fewer files after many appends). Meta shared by every part is kept."""
+        if self.num_parts > 1:
+            shared_meta = {}
+            for name in self._schema['columns']:
+                metas = [self.column_meta(i, name) for i in range(self.num_parts)]
+                if metas[0] is not None and all(m == metas[0] for m in metas):
+                    shared_meta[name] = metas[0]
+            self.overwrite(self.read())
+            if shared_meta:
+                self._schema['parts'][0]['meta'] = shared_meta
+                self._commit(self._schema)
+
+    # --- reading ---
+
+    def read_column(self, name: str, parts: Optional[List[int]] = None) -> np.ndarray:
+        """One column as an array; rows of parts that lack it are NaN (NaN+NaNj for complex)."""
+        dtype = self._schema['columns'][name]
+        selected = self._schema['parts'] if parts is None else [self._schema['parts'][i] for i in parts]
+        pieces = []
+        for part in selected:
+            files = part['files'].get(name)
+            if files is None:
+                fill = complex(np.nan, np.nan) if dtype == 'complex128' else np.nan
+                pieces.append(np.full(part['rows'], fill))
+            elif dtype == 'complex128':
+                real, imag = (np.load(os.path.join(self.path, f), mmap_mode='r') for f in files)
+                piece = np.empty(part['rows'], dtype=np.complex128)
+                piece.real, piece.imag = real, imag
+                pieces.append(piece)
+            else:
+                pieces.append(np.load(os.path.join(self.path, files[0]), mmap_mode='r'))
+        if not pieces:
+            return np.empty(0, dtype=dtype)
+        return np.concatenate(pieces)
+
+    def read(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """The table (or only the named columns) as a DataFrame."""
+        names = list(self._schema['columns']) if columns is None else list(columns)
+        missing = [name for name in names if name not in self._schema['columns']]
+        if missing:
+            raise KeyError(f"Columns {missing} are not in the results store at {self.path}.")
+        return pd.DataFrame({name: self.read_column(name) for name in names})
+
+    def part_columns(self) -> List[set]:
+        """For every part, the set of columns it has values for."""
+        return [set(part['files']) for part in self._schema['parts']]
+
+    def export_csv(self, csv_path: str, columns: Optional[List[str]] = None):
+        """Writes the table in the results CSV format (complex values as '(x+yj)')."""
+        self.read(columns).to_csv(csv_path, index=False)
+        # The export is not newer than the store, so load_results keeps reading the store
+        os.utime(self._schema_path)
+
+
+def _stored_dtype(series: pd.Series) -> str:
+    kind = series.dtype.kind
+    if kind in 'iu':
+        return 'int64'
+    if kind == 'f':
+        return 'float64'
+    if kind == 'b':
+        return 'bool'
+    if kind == 'c':
+        return 'complex128'
+    if kind == 'O' and _parse_complex(series) is not None:
+        return 'complex128'
+    raise TypeError(f"Column '{series.name}' has dtype {series.dtype}, which the results store cannot hold.")
+
+
+def _column_values(series: pd.Series, dtype: str) -> np.ndarray:
+    if dtype == 'complex128' and series.dtype.kind == 'O':
+        return _parse_complex(series)
+    return series.to_numpy(dtype=dtype)
+
+
+def _parse_complex(series: pd.Series) -> Optional[np.ndarray]:
+    """Complex strings such as '(0.5+1j)' (how pandas writes complex to CSV) as complex128, or None."""
+    try:
+        return np.array([complex(value) for value in series], dtype=np.complex128)
+    except (TypeError, ValueError):
+        return None
+
+
+def current_store(csv_path: str) -> Optional[ResultsStore]:
+    """The columnar store of csv_path if it exists and is not older than the CSV, else None."""
+    store = ResultsStore(results_store_path(csv_path))
+    if store.exists() and not _newer(csv_path, store._schema_path):
+        return store
+    return None
+
+
+def load_results(csv_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Results table for csv_path: from its columnar store when there is one that
+    is not older than the CSV, otherwise from the CSV itself (complex string
+    columns parsed to complex). A CSV written after the store (by hand, or by
+    a tool that only writes CSV) therefore wins.
+    columns limits the read to those columns. Raises FileNotFoundError if neither exists.
+    """
+    store = current_store(csv_path)
+    if store is not None:
+        return store.read(columns)
+
+    df = pd.read_csv(csv_path, usecols=columns)
+    if columns is not None:
+        df = df[list(columns)]
+    for name in df.columns:
+        if df[name].dtype.kind == 'O':
+            parsed = _parse_complex(df[name])
+            if parsed is not None:
+                df[name] = parsed
+    return df
+
+
+def save_results(df: pd.DataFrame, csv_path: str, export_csv: bool = True) -> ResultsStore:
+    """Replaces the columnar store of csv_path with df; export_csv also rewrites the CSV."""
+    if export_csv:
+        df.to_csv(csv_path, index=False)
+    # Written after the CSV so load_results keeps reading the store
+    store = ResultsStore(results_store_path(csv_path))
+    store.overwrite(df)
+    return store
+
+
+def _newer(path: str, than: str) -> bool:
+    return os.path.exists(path) and os.path.getmtime(path) > os.path.getmtime(than)
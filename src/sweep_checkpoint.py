@@ -0,0 +1,111 @@
+import datetime
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, Optional
+
+import pandas as pd
+
+from .results_store import ResultsStore
+
+DEFAULT_CHECKPOINT_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', 'data', 'cache', 'sweeps', 'experiment_01'))
+
+_PARAM_COLUMNS = ('a_divisor', 'b_multiplier', 'c_adder')
+
+
+class SweepCheckpoint:
+    """
+    On-disk progress of one parameter sweep, so an interrupted run can resume.
+
+    The checkpoint directory holds:
+    - manifest.json: the sweep settings (seed, sample count, test range, ...),
+      progress counts and whether the sweep completed
+    - rows/: a ResultsStore the sweep appends finished rows to in batches
+
+    A parameter set is done once its row is in the store. Every batch is
+    committed atomically, so after a crash each set is either fully stored
+    or recomputed, and never stored twice.
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_DIR):
+        self.path = path
+        self.manifest_path = os.path.join(path, 'manifest.json')
+        self.store = ResultsStore(os.path.join(path, 'rows'))
+
+    def load_manifest(self) -> Optional[Dict]:
+        if not os.path.exists(self.manifest_path):
+            return None
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: Dict):
+        os.makedirs(self.path, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix='.json.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def resumable(self, config: Dict) -> Optional[Dict]:
+        """
+        Manifest of an unfinished sweep whose settings match config, else None.
+        A None value in config (e.g. seed=None) matches any saved value.
+        """
+        manifest = self.load_manifest()
+        if manifest is None or manifest['complete']:
+            return None
+        saved = manifest['config']
+        if any(value is not None and saved.get(key) != value for key, value in config.items()):
+            return None
+        return manifest
+
+    def start(self, config: Dict, overwrite: bool = False) -> bool:
+        """
+        Continues the unfinished sweep with these exact settings, or starts a
+        new one in place of a completed checkpoint. An unfinished sweep with
+        other settings is only discarded with overwrite=True; otherwise this
+        raises ValueError and leaves it on disk. Returns True when resuming.
+        """
+        config = json.loads(json.dumps(config))  # tuples -> lists, as stored
+        manifest = self.resumable(config)
+        if manifest is not None and manifest['config'] == config:
+            return True
+
+        saved = self.load_manifest()
+        if saved is not None and not saved['complete'] and not overwrite:
+            raise ValueError(f"{self.path} holds an unfinished sweep with other settings ({saved['config']}); "
+                             f"use another checkpoint directory, or overwrite=True to discard it.")
+        if os.path.exists(self.path):
+            shutil.rmtree(self.path)
+        self.store = ResultsStore(os.path.join(self.path, 'rows'))
+        now = _now()
+        self._write_manifest({'config': config, 'complete': False, 'rows_done': 0,
+                              'created_at': now, 'updated_at': now})
+        return False
+
+    def rows_by_params(self) -> Dict[tuple, Dict]:
+        """Rows already stored, keyed by (a, b, c)."""
+        if not self.store.exists():
+            return {}
+        rows = self.store.read().to_dict('records')
+        return {tuple(int(row[column]) for column in _PARAM_COLUMNS): row for row in rows}
+
+    def record(self, rows: pd.DataFrame):
+        """Stores a batch of finished rows and updates the progress in the manifest."""
+        if rows.empty:
+            return
+        self.store.append(rows)
+        manifest = self.load_manifest()
+        manifest.update(rows_done=len(self.store), updated_at=_now())
+        self._write_manifest(manifest)
+
+    def finish(self):
+        """Marks the sweep complete; the next start() with any settings begins afresh."""
+        manifest = self.load_manifest()
+        manifest.update(complete=True, rows_done=len(self.store), updated_at=_now())
+        self._write_manifest(manifest)
+
+
+def _now() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()